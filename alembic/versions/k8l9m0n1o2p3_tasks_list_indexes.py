@@ -0,0 +1,61 @@
+"""Indexes matching the /tasks list filters and report lookups.
+
+Revision ID: k8l9m0n1o2p3
+Revises: j7k8l9m0n1o2
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "k8l9m0n1o2p3"
+down_revision = "j7k8l9m0n1o2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # executor_role_id = :role_id / ANY(:team_executor_role_ids) ... ORDER BY task_id DESC LIMIT
+    # becomes an ordered index range scan; supersedes the single-column index.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_tasks_executor_role_task_id
+            ON public.tasks (executor_role_id, task_id DESC)
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS public.idx_tasks_executor_role_id")
+
+    # Explicit-approver branch of the "mine" filter.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_tasks_approver_user
+            ON public.tasks (approver_user_id)
+            WHERE approver_user_id IS NOT NULL
+        """
+    )
+
+    # Latest-report LATERAL in list/get and the "reported by me" EXISTS.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_task_reports_task_id
+            ON public.task_reports (task_id)
+        """
+    )
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_task_reports_submitted_by_task
+            ON public.task_reports (submitted_by, task_id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.ix_task_reports_submitted_by_task")
+    op.execute("DROP INDEX IF EXISTS public.ix_task_reports_task_id")
+    op.execute("DROP INDEX IF EXISTS public.ix_tasks_approver_user")
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_tasks_executor_role_id
+            ON public.tasks (executor_role_id)
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS public.ix_tasks_executor_role_task_id")
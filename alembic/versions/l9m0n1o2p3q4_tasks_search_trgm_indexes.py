@@ -0,0 +1,42 @@
+"""Trigram indexes for /tasks ILIKE search (when pg_trgm is available).
+
+Revision ID: l9m0n1o2p3q4
+Revises: k8l9m0n1o2p3
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "l9m0n1o2p3q4"
+down_revision = "k8l9m0n1o2p3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm ships with contrib; skip quietly on servers built without it so the
+    # search keeps working (as a scan) instead of failing the migration chain.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+                CREATE INDEX IF NOT EXISTS ix_tasks_title_trgm
+                    ON public.tasks USING gin (title gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS ix_tasks_description_trgm
+                    ON public.tasks USING gin (description gin_trgm_ops);
+                CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm
+                    ON public.users USING gin (full_name gin_trgm_ops);
+            END IF;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.ix_users_full_name_trgm")
+    op.execute("DROP INDEX IF EXISTS public.ix_tasks_description_trgm")
+    op.execute("DROP INDEX IF EXISTS public.ix_tasks_title_trgm")
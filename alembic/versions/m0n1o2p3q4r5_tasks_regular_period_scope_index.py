@@ -0,0 +1,29 @@
+"""Index for the regular-task lookups by (regular_task_id, period_id, assignment_scope).
+
+Revision ID: m0n1o2p3q4r5
+Revises: l9m0n1o2p3q4
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "m0n1o2p3q4r5"
+down_revision = "l9m0n1o2p3q4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generation / approval follow-up look for the active task of a template in a
+    # period and scope (tasks_fsm, regular_tasks_service); adhoc tasks are excluded.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_tasks_regular_period_scope
+            ON public.tasks (regular_task_id, period_id, assignment_scope)
+            WHERE regular_task_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.ix_tasks_regular_period_scope")
@@ -0,0 +1,34 @@
+"""task_audit_log.actor_role: TEXT -> BIGINT (role_id).
+
+Revision ID: n1o2p3q4r5s6
+Revises: m0n1o2p3q4r5
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "n1o2p3q4r5s6"
+down_revision = "m0n1o2p3q4r5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # write_task_audit has only ever stored str(role_id); anything non-numeric becomes NULL.
+    op.execute(
+        r"""
+        ALTER TABLE public.task_audit_log
+            ALTER COLUMN actor_role TYPE BIGINT
+            USING CASE WHEN btrim(actor_role) ~ '^\d+$' THEN btrim(actor_role)::bigint END
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE public.task_audit_log
+            ALTER COLUMN actor_role TYPE TEXT
+            USING actor_role::text
+        """
+    )
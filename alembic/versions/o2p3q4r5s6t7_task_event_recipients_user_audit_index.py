@@ -0,0 +1,35 @@
+"""Keyset index for /tasks/me/events: task_event_recipients (user_id, audit_id).
+
+Revision ID: o2p3q4r5s6t7
+Revises: n1o2p3q4r5s6
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "o2p3q4r5s6t7"
+down_revision = "n1o2p3q4r5s6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # WHERE user_id = :uid AND audit_id > :cursor ORDER BY audit_id becomes a range scan
+    # with no sort; the single-column (user_id) index is a prefix of it.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_task_event_recipients_user_audit
+            ON public.task_event_recipients (user_id, audit_id)
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS public.idx_task_event_recipients_user")
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_task_event_recipients_user
+            ON public.task_event_recipients (user_id)
+        """
+    )
+    op.execute("DROP INDEX IF EXISTS public.ix_task_event_recipients_user_audit")
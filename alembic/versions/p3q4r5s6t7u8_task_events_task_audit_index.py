@@ -0,0 +1,28 @@
+"""Index for per-task event listing: task_events (task_id, audit_id).
+
+Revision ID: p3q4r5s6t7u8
+Revises: o2p3q4r5s6t7
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "p3q4r5s6t7u8"
+down_revision = "o2p3q4r5s6t7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # WHERE task_id = :task_id ORDER BY audit_id LIMIT n becomes a range scan with no
+    # sort; it also backs the ON DELETE CASCADE from tasks, which had no index to use.
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_task_events_task_audit
+            ON public.task_events (task_id, audit_id)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS public.ix_task_events_task_audit")
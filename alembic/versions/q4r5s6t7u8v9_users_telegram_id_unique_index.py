@@ -0,0 +1,64 @@
+"""Unique partial index on users.telegram_id for bot identity lookups.
+
+Revision ID: q4r5s6t7u8v9
+Revises: p3q4r5s6t7u8
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "q4r5s6t7u8v9"
+down_revision = "p3q4r5s6t7u8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Every internal bot request resolves its user by telegram_id, and tg bind checks
+    # the id is free; both were sequential scans.
+    #
+    # A blank value already means "unbound" everywhere (tg_bind, ops007 integrity
+    # counts); store it as NULL so blanks neither trip the duplicate check nor collide
+    # in the index, and the predicate stays one "telegram_id = :tg" lookups can use.
+    op.execute(
+        """
+        UPDATE public.users
+        SET telegram_id = NULL
+        WHERE telegram_id IS NOT NULL
+          AND btrim(telegram_id::text) = ''
+        """
+    )
+    # tg_bind already refuses to bind one Telegram id to two users, so remaining
+    # duplicates mean hand-edited data: stop loudly.
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1
+                FROM public.users
+                WHERE telegram_id IS NOT NULL
+                GROUP BY telegram_id
+                HAVING COUNT(*) > 1
+            ) THEN
+                RAISE EXCEPTION
+                    'users.telegram_id has duplicates; unbind them before upgrading '
+                    '(SELECT telegram_id FROM users WHERE telegram_id IS NOT NULL '
+                    'GROUP BY 1 HAVING COUNT(*) > 1)';
+            END IF;
+        END
+        $$;
+        """
+    )
+    op.execute(
+        """
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_users_telegram_id
+            ON public.users (telegram_id)
+            WHERE telegram_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    # Blanks normalised to NULL are not restored: both mean unbound.
+    op.execute("DROP INDEX IF EXISTS public.ux_users_telegram_id")
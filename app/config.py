@@ -32,6 +32,15 @@ def cabinet_access_shadow_mode_enabled() -> bool:
     return env("CABINET_ACCESS_SHADOW_MODE", "false").lower() in {"1", "true", "yes", "on"}
 
 
+def threadpool_size() -> int:
+    """Worker threads for sync (def) endpoints; 0 keeps the anyio default of 40."""
+    raw = env("APP_THREADPOOL_SIZE", "0")
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return 0
+
+
 def cors_allowed_origins() -> List[str]:
     raw = env("CORS_ALLOWED_ORIGINS")
     if raw:
@@ -1,6 +1,7 @@
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -10,7 +11,78 @@ if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set")
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = (os.getenv(name) or "").strip()
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
+# psycopg2 has no server-side statement cache, so the reusable piece is
+# SQLAlchemy's compiled-statement cache; list endpoints build several
+# text() variants per filter shape, which outgrows the default of 500.
+DB_QUERY_CACHE_SIZE = _env_int("DB_QUERY_CACHE_SIZE", 1200)
+
+# Pool sizing: pool_size + max_overflow per worker process should cover the
+# worker threadpool (APP_THREADPOOL_SIZE) and stay under Postgres max_connections
+# across all workers. LIFO keeps hot connections reused and lets extras idle out.
+DB_POOL_SIZE = _env_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT_S = _env_int("DB_POOL_TIMEOUT_S", 30)
+DB_POOL_RECYCLE_S = _env_int("DB_POOL_RECYCLE_S", 1800)
+# Server-side guard against connections left idle inside a transaction (0 = off).
+DB_IDLE_IN_TX_TIMEOUT_MS = _env_int("DB_IDLE_IN_TX_TIMEOUT_MS", 0)
+# Behind PgBouncer (transaction mode) the bouncer owns pooling: open/close per
+# checkout instead of stacking a second pool on top. psycopg2 sends no
+# server-side PREPARE, so transaction pooling needs nothing else.
+DB_EXTERNAL_POOLER = (os.getenv("DB_EXTERNAL_POOLER") or "").strip().lower() in {"1", "true", "yes", "on"}
+# Connections to open at startup (capped at DB_POOL_SIZE) so the first requests
+# after a deploy skip the TCP/auth handshake (0 = open lazily).
+DB_POOL_WARM = _env_int("DB_POOL_WARM", 0)
+
+
+def _connect_args() -> dict:
+    if DB_IDLE_IN_TX_TIMEOUT_MS > 0:
+        return {"options": f"-c idle_in_transaction_session_timeout={DB_IDLE_IN_TX_TIMEOUT_MS}"}
+    return {}
+
+
+def _pool_args() -> dict:
+    if DB_EXTERNAL_POOLER:
+        return {"poolclass": NullPool}
+    return {
+        "pool_pre_ping": True,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_S,
+        "pool_recycle": DB_POOL_RECYCLE_S,
+        "pool_use_lifo": True,
+    }
+
+
 engine: Engine = create_engine(
     DATABASE_URL,
-    pool_pre_ping=True,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
+    connect_args=_connect_args(),
+    **_pool_args(),
 )
+
+
+def connect_autocommit():
+    """Connection for single-statement reads: no BEGIN/ROLLBACK pair around the query."""
+    return engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+
+
+def warm_pool(count: int = DB_POOL_WARM) -> int:
+    """Open up to `count` connections and return them to the pool; returns how many."""
+    if DB_EXTERNAL_POOLER or count <= 0:
+        return 0
+    conns = []
+    try:
+        for _ in range(min(int(count), DB_POOL_SIZE)):
+            conns.append(engine.connect())
+    finally:
+        for conn in conns:
+            conn.close()
+    return len(conns)
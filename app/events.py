@@ -42,31 +42,23 @@ def _parse_str_set(env_name: str) -> Set[str]:
 SUPERVISOR_ROLE_IDS = _parse_int_set("SUPERVISOR_ROLE_IDS")
 DEPUTY_ROLE_IDS = _parse_int_set("DEPUTY_ROLE_IDS")
 DIRECTOR_ROLE_IDS = _parse_int_set("DIRECTOR_ROLE_IDS")
+MANAGEMENT_ROLE_IDS = frozenset(SUPERVISOR_ROLE_IDS | DEPUTY_ROLE_IDS | DIRECTOR_ROLE_IDS)
 
 
-def _lookup_role_ids_by_codes_tx(conn, codes: Iterable[str]) -> List[int]:
-    code_list = [str(c).strip().upper() for c in codes if str(c).strip()]
-    if not code_list:
-        return []
-    rows = conn.execute(
-        text(
-            """
-            SELECT role_id
-            FROM public.roles
-            WHERE upper(code) = ANY(:codes)
-            """
-        ),
-        {"codes": code_list},
-    ).scalars().all()
-    out: List[int] = []
-    for r in rows:
-        try:
-            iv = int(r)
-            if iv > 0:
-                out.append(iv)
-        except Exception:
-            continue
-    return out
+# Исполнители задачи (executor_role_id) + руководство (env-роли и QM_HEAD)
+# одним запросом; исполнители идут первыми.
+_ROLE_RECIPIENTS_SQL = text(
+    """
+    SELECT u.user_id
+    FROM public.users u
+    WHERE COALESCE(u.is_active, true) = true
+      AND (
+        u.role_id = ANY(:rids)
+        OR u.role_id IN (SELECT r.role_id FROM public.roles r WHERE upper(r.code) = 'QM_HEAD')
+      )
+    ORDER BY (u.role_id = :executor_rid) DESC, u.user_id
+    """
+)
 
 # allow-list Telegram (если пусто — ограничения нет)
 TELEGRAM_DELIVERY_ALLOW_USER_IDS: Set[int] = _parse_int_set("TELEGRAM_DELIVERY_ALLOW_USER_IDS")
@@ -79,20 +71,21 @@ TELEGRAM_FOR_TYPES: Set[str] = _parse_str_set("TASK_EVENTS_TELEGRAM_TYPES")
 
 
 def _uniq_ints(xs: Iterable[Optional[int]]) -> List[int]:
-    out: List[int] = []
-    seen: Set[int] = set()
+    # Order-preserving dedupe; ints from the DB skip the int()/try path.
+    seen: Dict[int, None] = {}
     for x in xs:
         if x is None:
             continue
-        try:
-            ix = int(x)
-        except Exception:
-            continue
-        if ix <= 0 or ix in seen:
-            continue
-        seen.add(ix)
-        out.append(ix)
-    return out
+        if type(x) is int:
+            ix = x
+        else:
+            try:
+                ix = int(x)
+            except Exception:
+                continue
+        if ix > 0:
+            seen[ix] = None
+    return list(seen)
 
 
 def _should_drop_self(event_type: str) -> bool:
@@ -214,20 +207,23 @@ def _latest_report_info_tx(conn, task_id: int) -> Optional[Dict[str, Any]]:
     return dict(row) if row else None
 
 
+_LATEST_REPORT_SUBMITTED_BY_SQL = text(
+    """
+    SELECT tr.submitted_by
+    FROM public.task_reports tr
+    WHERE tr.task_id = :tid
+    ORDER BY tr.submitted_at DESC NULLS LAST, tr.report_id DESC
+    LIMIT 1
+    """
+)
+
+
 def _latest_report_submitted_by_tx(conn, task_id: int) -> Optional[int]:
     """
     Возвращает submitted_by по последнему отчёту в task_reports для task_id.
     """
     row = conn.execute(
-        text(
-            """
-            SELECT tr.submitted_by
-            FROM public.task_reports tr
-            WHERE tr.task_id = :tid
-            ORDER BY tr.submitted_at DESC NULLS LAST, tr.report_id DESC
-            LIMIT 1
-            """
-        ),
+        _LATEST_REPORT_SUBMITTED_BY_SQL,
         {"tid": int(task_id)},
     ).mappings().first()
     if not row:
@@ -257,41 +253,14 @@ def resolve_recipients_for_task_event_tx(
     if bindings:
         recipients = _resolve_bindings_to_user_ids_tx(conn, bindings)
     else:
-        executor_users = conn.execute(
-            text(
-                """
-                SELECT u.user_id
-                FROM public.users u
-                WHERE u.role_id = :rid
-                  AND COALESCE(u.is_active, true) = true
-                """
-            ),
-            {"rid": int(task.executor_role_id)},
+        executor_rid = int(task.executor_role_id)
+        role_ids = sorted(MANAGEMENT_ROLE_IDS | {executor_rid})
+        role_users = conn.execute(
+            _ROLE_RECIPIENTS_SQL,
+            {"rids": role_ids, "executor_rid": executor_rid},
         ).scalars().all()
 
-        mgmt_role_ids = sorted(
-            set(SUPERVISOR_ROLE_IDS)
-            | set(DEPUTY_ROLE_IDS)
-            | set(DIRECTOR_ROLE_IDS)
-            | set(_lookup_role_ids_by_codes_tx(conn, ["QM_HEAD"]))
-        )
-        mgmt_users: List[int] = []
-        if mgmt_role_ids:
-            mgmt_users = conn.execute(
-                text(
-                    """
-                    SELECT u.user_id
-                    FROM public.users u
-                    WHERE u.role_id = ANY(:rids)
-                      AND COALESCE(u.is_active, true) = true
-                    """
-                ),
-                {"rids": mgmt_role_ids},
-            ).scalars().all()
-
-        recipients = _uniq_ints(
-            [task.initiator_user_id] + [int(x) for x in executor_users] + [int(x) for x in mgmt_users]
-        )
+        recipients = _uniq_ints([task.initiator_user_id, *role_users])
 
     # ----------------------------------------
     # IMPORTANT UX RULE:
@@ -313,6 +282,59 @@ def resolve_recipients_for_task_event_tx(
     return recipients
 
 
+_EVENT_TASK_SQL = text(
+    """
+    SELECT task_id, initiator_user_id, executor_role_id, title
+    FROM public.tasks
+    WHERE task_id = :tid
+    """
+)
+
+
+# Событие и вся раздача по каналам одним statement: task_events, recipients,
+# system (всегда SENT) и telegram (PENDING) для :tg_uids с привязанным
+# Telegram. Пустые :uids / :tg_uids просто ничего не вставляют.
+_INSERT_EVENT_AND_DELIVERIES_SQL = text(
+    """
+    WITH ev AS (
+        INSERT INTO public.task_events
+          (task_id, event_type, actor_user_id, actor_role_id, payload)
+        VALUES
+          (:task_id, :event_type, :actor_user_id, :actor_role_id, CAST(:payload AS jsonb))
+        RETURNING audit_id
+    ),
+    x AS (
+        SELECT UNNEST(CAST(:uids AS bigint[])) AS user_id
+    ),
+    r AS (
+        INSERT INTO public.task_event_recipients (audit_id, user_id)
+        SELECT ev.audit_id, x.user_id
+        FROM ev CROSS JOIN x
+        ON CONFLICT DO NOTHING
+    ),
+    s AS (
+        INSERT INTO public.task_event_deliveries
+          (audit_id, user_id, channel, status, sent_at)
+        SELECT ev.audit_id, x.user_id, 'system', 'SENT', now()
+        FROM ev CROSS JOIN x
+        ON CONFLICT (audit_id, user_id, channel) DO NOTHING
+    ),
+    tg AS (
+        INSERT INTO public.task_event_deliveries
+          (audit_id, user_id, channel, status)
+        SELECT ev.audit_id, u.user_id, 'telegram', 'PENDING'
+        FROM ev
+        JOIN public.users u ON u.user_id = ANY(CAST(:tg_uids AS bigint[]))
+        WHERE u.telegram_id IS NOT NULL
+          AND trim(u.telegram_id::text) <> ''
+          AND COALESCE(u.is_active, TRUE) = TRUE
+        ON CONFLICT (audit_id, user_id, channel) DO NOTHING
+    )
+    SELECT audit_id FROM ev
+    """
+)
+
+
 def create_task_event_tx(
     conn,
     *,
@@ -333,13 +355,7 @@ def create_task_event_tx(
         payload = {"payload": payload}
 
     row = conn.execute(
-        text(
-            """
-            SELECT task_id, initiator_user_id, executor_role_id, title
-            FROM public.tasks
-            WHERE task_id = :tid
-            """
-        ),
+        _EVENT_TASK_SQL,
         {"tid": int(task_id)},
     ).mappings().first()
     if not row:
@@ -382,98 +398,25 @@ def create_task_event_tx(
         payload=payload,
     )
 
+    tg_uids: List[int] = []
+    if recipients and "telegram" in _channels_for_event_type(et):
+        tg_uids = recipients
+        if TELEGRAM_DELIVERY_ALLOW_USER_IDS:
+            tg_uids = [uid for uid in recipients if uid in TELEGRAM_DELIVERY_ALLOW_USER_IDS]
+
     audit_id = conn.execute(
-        text(
-            """
-            INSERT INTO public.task_events
-              (task_id, event_type, actor_user_id, actor_role_id, payload)
-            VALUES
-              (:task_id, :event_type, :actor_user_id, :actor_role_id, CAST(:payload AS jsonb))
-            RETURNING audit_id
-            """
-        ),
+        _INSERT_EVENT_AND_DELIVERIES_SQL,
         {
             "task_id": int(task_id),
             "event_type": et,
             "actor_user_id": int(actor_user_id),
             "actor_role_id": int(actor_role_id) if actor_role_id is not None else None,
-            "payload": json.dumps(payload, ensure_ascii=False),
+            "payload": json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+            "uids": recipients,
+            "tg_uids": tg_uids,
         },
     ).scalar_one()
 
-    if not recipients:
-        return int(audit_id)
-
-    conn.execute(
-        text(
-            """
-            INSERT INTO public.task_event_recipients (audit_id, user_id)
-            SELECT :audit_id, x.user_id
-            FROM (
-                SELECT UNNEST(CAST(:uids AS bigint[])) AS user_id
-            ) x
-            ON CONFLICT DO NOTHING
-            """
-        ),
-        {"audit_id": int(audit_id), "uids": recipients},
-    )
-
-    # system — всегда SENT
-    conn.execute(
-        text(
-            """
-            INSERT INTO public.task_event_deliveries
-              (audit_id, user_id, channel, status, sent_at)
-            SELECT :audit_id, x.user_id, 'system', 'SENT', now()
-            FROM (
-                SELECT UNNEST(CAST(:uids AS bigint[])) AS user_id
-            ) x
-            ON CONFLICT (audit_id, user_id, channel) DO NOTHING
-            """
-        ),
-        {"audit_id": int(audit_id), "uids": recipients},
-    )
-
-    channels = _channels_for_event_type(et)
-
-    if "telegram" in channels:
-        filtered_uids = recipients
-        if TELEGRAM_DELIVERY_ALLOW_USER_IDS:
-            filtered_uids = [uid for uid in recipients if uid in TELEGRAM_DELIVERY_ALLOW_USER_IDS]
-
-        if filtered_uids:
-            tg_rows = conn.execute(
-                text(
-                    """
-                    SELECT u.user_id
-                    FROM public.users u
-                    WHERE u.user_id = ANY(:uids)
-                      AND u.telegram_id IS NOT NULL
-                      AND trim(u.telegram_id::text) <> ''
-                      AND COALESCE(u.is_active, TRUE) = TRUE
-                    """
-                ),
-                {"uids": filtered_uids},
-            ).scalars().all()
-
-            tg_uids = _uniq_ints([int(x) for x in tg_rows])
-
-            if tg_uids:
-                conn.execute(
-                    text(
-                        """
-                        INSERT INTO public.task_event_deliveries
-                          (audit_id, user_id, channel, status)
-                        SELECT :audit_id, x.user_id, 'telegram', 'PENDING'
-                        FROM (
-                            SELECT UNNEST(CAST(:uids AS bigint[])) AS user_id
-                        ) x
-                        ON CONFLICT (audit_id, user_id, channel) DO NOTHING
-                        """
-                    ),
-                    {"audit_id": int(audit_id), "uids": tg_uids},
-                )
-
     return int(audit_id)
 
 
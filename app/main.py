@@ -1,26 +1,28 @@
 # FILE: app/main.py
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
 from datetime import date
 from typing import Dict, Any, List
 
 import app.config  # noqa: F401 — load .env before other app imports
 
-from app.config import cors_allowed_origins, is_prod_env, validate_production_secrets
+from app.config import cors_allowed_origins, is_prod_env, threadpool_size, validate_production_secrets
 
 validate_production_secrets()
 
+import anyio.to_thread
 from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from fastapi.openapi.utils import get_openapi
 from pydantic import BaseModel, Field
 from sqlalchemy import text
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
+from app.core.json_response import UTF8JSONResponse
 from app.errors import raise_error, ErrorCode
 
-from app.db.engine import engine
+from app.db.engine import engine, warm_pool
 from app.meta import router as meta_router
 from app.tasks import router as tasks_router
 from app.task_events import router as task_events_router
@@ -30,6 +32,7 @@ from app.directory import router as directory_router
 from app.auth import router as auth_router  # /auth/login, /auth/me
 from app.auth import get_current_user
 from app.security.directory_scope import is_privileged
+from app.services.tasks_service import warm_reference_caches
 
 # regular tasks
 from app.services.regular_tasks_router import router as internal_regular_tasks_router
@@ -48,8 +51,21 @@ from app.operational_orders.router import router as operational_orders_router
 from app.incoming_information.router import router as incoming_information_router
 
 
-class UTF8JSONResponse(JSONResponse):
-    media_type = "application/json; charset=utf-8"
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    # Sync handlers hold a threadpool slot for the whole DB call; the anyio
+    # default (40) becomes the concurrency ceiling under load.
+    size = threadpool_size()
+    if size:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = size
+    # Best effort: if the DB is not reachable yet the caches fill on first use.
+    try:
+        warm_pool()
+        with engine.connect() as conn:
+            warm_reference_caches(conn)
+    except SQLAlchemyError:
+        pass
+    yield
 
 
 _docs_url = None if is_prod_env() else "/docs"
@@ -59,6 +75,7 @@ _openapi_url = None if is_prod_env() else "/openapi.json"
 app = FastAPI(
     title="Corpsite MVP",
     default_response_class=UTF8JSONResponse,
+    lifespan=_lifespan,
     docs_url=_docs_url,
     redoc_url=_redoc_url,
     openapi_url=_openapi_url,
@@ -105,18 +105,6 @@ def _column_exists(conn: Connection, table: str, column: str) -> bool:
     return row is not None
 
 
-def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
-    if not value:
-        return None
-    text_val = value.strip()
-    if text_val.endswith("Z"):
-        text_val = text_val[:-1] + "+00:00"
-    parsed = datetime.fromisoformat(text_val)
-    if parsed.tzinfo is None:
-        return parsed.replace(tzinfo=timezone.utc)
-    return parsed.astimezone(timezone.utc)
-
-
 def _read_jsonl_records(package_path: Path, filename: str) -> list[dict[str, Any]]:
     with zipfile.ZipFile(package_path, mode="r") as archive:
         if filename not in archive.namelist():
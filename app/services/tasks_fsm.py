@@ -18,6 +18,25 @@ class TaskFSMError(Exception):
     pass
 
 
+_TRANSITION_TASK_SQL = text(
+    """
+    SELECT
+        t.task_id,
+        t.regular_task_id,
+        t.initiator_user_id,
+        t.approver_user_id,
+        t.executor_role_id,
+        t.requires_report,
+        t.requires_approval,
+        t.task_kind,
+        ts.code AS status_code
+    FROM tasks t
+    JOIN task_statuses ts ON ts.status_id = t.status_id
+    WHERE t.task_id = :tid
+    """
+)
+
+
 def transition(
     *,
     conn: Connection,
@@ -26,34 +45,26 @@ def transition(
     actor_user_id: int,
     actor_role_id: int,
     payload: Optional[Dict[str, Any]] = None,
+    task_row: Optional[Dict[str, Any]] = None,
 ) -> None:
+    """
+    task_row: уже загруженная строка задачи (load_task_full) — тогда повторный
+    SELECT не делаем. Без неё читаем минимальный набор полей сами.
+    """
     payload = payload or {}
 
-    row = conn.execute(
-        text(
-            """
-            SELECT
-                t.task_id,
-                t.regular_task_id,
-                t.initiator_user_id,
-                t.approver_user_id,
-                t.executor_role_id,
-                t.requires_report,
-                t.requires_approval,
-                t.task_kind,
-                ts.code AS status_code
-            FROM tasks t
-            JOIN task_statuses ts ON ts.status_id = t.status_id
-            WHERE t.task_id = :tid
-            """
-        ),
-        {"tid": int(task_id)},
-    ).mappings().first()
+    if task_row is not None:
+        task_row = dict(task_row)
+    else:
+        row = conn.execute(
+            _TRANSITION_TASK_SQL,
+            {"tid": int(task_id)},
+        ).mappings().first()
 
-    if not row:
-        raise TaskFSMError("Task not found")
+        if not row:
+            raise TaskFSMError("Task not found")
 
-    task_row = dict(row)
+        task_row = dict(row)
     from_status = str(task_row["status_code"] or "")
 
     if action == "report":
@@ -112,17 +123,20 @@ def _as_bool(value: Any, default: bool = True) -> bool:
         return bool(default)
 
 
+_LATEST_REPORT_SQL = text(
+    """
+    SELECT report_id, submitted_by
+    FROM public.task_reports
+    WHERE task_id = :tid
+    ORDER BY report_id DESC
+    LIMIT 1
+    """
+)
+
+
 def _get_latest_report_row(conn: Connection, task_id: int) -> Dict[str, Any]:
     row = conn.execute(
-        text(
-            """
-            SELECT report_id, submitted_by
-            FROM public.task_reports
-            WHERE task_id = :tid
-            ORDER BY report_id DESC
-            LIMIT 1
-            """
-        ),
+        _LATEST_REPORT_SQL,
         {"tid": int(task_id)},
     ).mappings().first()
     if not row or row.get("report_id") is None:
@@ -134,6 +148,9 @@ def _ensure_report_exists(conn: Connection, task_id: int) -> None:
     _get_latest_report_row(conn, task_id)
 
 
+_SET_STATUS_SQL = text("UPDATE tasks SET status_id = :sid WHERE task_id = :tid")
+
+
 def _set_status(
     conn: Connection,
     task_id: int,
@@ -158,7 +175,7 @@ def _set_status(
     status_id = get_status_id_by_code(conn, to_status)
 
     conn.execute(
-        text("UPDATE tasks SET status_id = :sid WHERE task_id = :tid"),
+        _SET_STATUS_SQL,
         {"sid": int(status_id), "tid": int(task_id)},
     )
 
@@ -171,6 +188,24 @@ def _extract_report_link(payload: Dict[str, Any]) -> str:
     return s
 
 
+_TASK_REGULAR_ID_SQL = text(
+    """
+    SELECT t.regular_task_id
+    FROM public.tasks t
+    WHERE t.task_id = :tid
+    """
+)
+
+
+_REGULAR_TASK_ROLES_SQL = text(
+    """
+    SELECT regular_task_id, executor_role_id, target_role_id
+    FROM public.regular_tasks
+    WHERE regular_task_id = :rid
+    """
+)
+
+
 def _get_roles_for_task_flow(conn: Connection, task_id: int) -> Tuple[Optional[int], Optional[int], Optional[int]]:
     """
     Возвращает (regular_task_id, performer_role_id, approver_role_id).
@@ -183,13 +218,7 @@ def _get_roles_for_task_flow(conn: Connection, task_id: int) -> Tuple[Optional[i
     либо (rid, None, None), если regular_task_id есть, но шаблон не найден.
     """
     row = conn.execute(
-        text(
-            """
-            SELECT t.regular_task_id
-            FROM public.tasks t
-            WHERE t.task_id = :tid
-            """
-        ),
+        _TASK_REGULAR_ID_SQL,
         {"tid": int(task_id)},
     ).mappings().first()
     if not row or row.get("regular_task_id") is None:
@@ -197,13 +226,7 @@ def _get_roles_for_task_flow(conn: Connection, task_id: int) -> Tuple[Optional[i
 
     rid = int(row["regular_task_id"])
     rt = conn.execute(
-        text(
-            """
-            SELECT regular_task_id, executor_role_id, target_role_id
-            FROM public.regular_tasks
-            WHERE regular_task_id = :rid
-            """
-        ),
+        _REGULAR_TASK_ROLES_SQL,
         {"rid": int(rid)},
     ).mappings().first()
     if not rt:
@@ -223,103 +246,118 @@ def _get_roles_for_task_flow(conn: Connection, task_id: int) -> Tuple[Optional[i
     return rid, performer_id, approver_id
 
 
+_SET_EXECUTOR_ROLE_SQL = text("UPDATE public.tasks SET executor_role_id = :rid WHERE task_id = :tid")
+
+
 def _set_executor_role_if_needed(conn: Connection, task_id: int, role_id: Optional[int]) -> None:
     if role_id is None or int(role_id) <= 0:
         return
     conn.execute(
-        text("UPDATE public.tasks SET executor_role_id = :rid WHERE task_id = :tid"),
+        _SET_EXECUTOR_ROLE_SQL,
         {"rid": int(role_id), "tid": int(task_id)},
     )
 
 
+_USER_UNIT_SQL = text(
+    """
+    SELECT u.unit_id
+    FROM public.users u
+    WHERE u.user_id = :uid
+    """
+)
+
+
 def _get_user_unit_id(conn: Connection, user_id: int) -> Optional[int]:
-    row = conn.execute(
-        text(
-            """
-            SELECT u.unit_id
-            FROM public.users u
-            WHERE u.user_id = :uid
-            """
-        ),
+    value = conn.execute(
+        _USER_UNIT_SQL,
         {"uid": int(user_id)},
-    ).mappings().first()
-    if not row or row.get("unit_id") is None:
+    ).scalar()
+    if value is None:
         return None
     try:
-        unit_id = int(row["unit_id"])
+        unit_id = int(value)
         return unit_id if unit_id > 0 else None
     except Exception:
         return None
 
 
+_ACTIVE_USER_ROLE_SQL = text(
+    """
+    SELECT role_id
+    FROM public.users
+    WHERE user_id = :uid
+      AND is_active = TRUE
+    """
+)
+
+
 def _get_user_role_id(conn: Connection, user_id: int) -> Optional[int]:
-    rr = conn.execute(
-        text(
-            """
-            SELECT role_id
-            FROM public.users
-            WHERE user_id = :uid
-              AND is_active = TRUE
-            """
-        ),
+    value = conn.execute(
+        _ACTIVE_USER_ROLE_SQL,
         {"uid": int(user_id)},
-    ).mappings().first()
-    if not rr or rr.get("role_id") is None:
+    ).scalar()
+    if value is None:
         return None
     try:
-        rid = int(rr["role_id"])
+        rid = int(value)
         return rid if rid > 0 else None
     except Exception:
         return None
 
 
+_PARENT_UNIT_SQL = text(
+    """
+    SELECT parent_unit_id
+    FROM public.org_units
+    WHERE unit_id = :unit_id
+    """
+)
+
+
 def _get_parent_unit_id(conn: Connection, unit_id: int) -> Optional[int]:
-    parent = conn.execute(
-        text(
-            """
-            SELECT parent_unit_id
-            FROM public.org_units
-            WHERE unit_id = :unit_id
-            """
-        ),
+    value = conn.execute(
+        _PARENT_UNIT_SQL,
         {"unit_id": int(unit_id)},
-    ).mappings().first()
-    if not parent or parent.get("parent_unit_id") is None:
+    ).scalar()
+    if value is None:
         return None
     try:
-        pid = int(parent["parent_unit_id"])
+        pid = int(value)
         return pid if pid > 0 else None
     except Exception:
         return None
 
 
+_ACTIVE_HEAD_USER_SQL = text(
+    """
+    SELECT m.user_id
+    FROM public.org_unit_managers m
+    JOIN public.users u
+      ON u.user_id = m.user_id
+    WHERE m.unit_id = :unit_id
+      AND upper(btrim(COALESCE(m.manager_type, ''))) = 'HEAD'
+      AND m.is_active = TRUE
+      AND u.is_active = TRUE
+      AND (m.date_from IS NULL OR m.date_from <= CURRENT_DATE)
+      AND (m.date_to   IS NULL OR m.date_to   >= CURRENT_DATE)
+    ORDER BY
+        CASE WHEN m.date_from IS NULL THEN 1 ELSE 0 END,
+        m.date_from DESC NULLS LAST,
+        m.manager_id DESC
+    LIMIT 1
+    """
+)
+
+
 def _find_active_head_user_id(conn: Connection, unit_id: int) -> Optional[int]:
-    row = conn.execute(
-        text(
-            """
-            SELECT m.user_id
-            FROM public.org_unit_managers m
-            JOIN public.users u
-              ON u.user_id = m.user_id
-            WHERE m.unit_id = :unit_id
-              AND upper(btrim(COALESCE(m.manager_type, ''))) = 'HEAD'
-              AND m.is_active = TRUE
-              AND u.is_active = TRUE
-              AND (m.date_from IS NULL OR m.date_from <= CURRENT_DATE)
-              AND (m.date_to   IS NULL OR m.date_to   >= CURRENT_DATE)
-            ORDER BY
-                CASE WHEN m.date_from IS NULL THEN 1 ELSE 0 END,
-                m.date_from DESC NULLS LAST,
-                m.manager_id DESC
-            LIMIT 1
-            """
-        ),
+    value = conn.execute(
+        _ACTIVE_HEAD_USER_SQL,
         {"unit_id": int(unit_id)},
-    ).mappings().first()
-    if not row or row.get("user_id") is None:
+    ).scalar()
+    if value is None:
         return None
     try:
-        uid = int(row["user_id"])
+        uid = int(value)
         return uid if uid > 0 else None
     except Exception:
         return None
@@ -629,6 +667,15 @@ def _maybe_create_or_update_next_task_after_approved(
 # Transitions
 # ---------------------------
 
+_INSERT_REPORT_SQL = text(
+    """
+    INSERT INTO task_reports (task_id, report_link, submitted_by, current_comment, submitted_at)
+    VALUES (:tid, :link, :by, :comment, now())
+    RETURNING report_id
+    """
+)
+
+
 def _report(
     conn: Connection,
     task_row: Dict[str, Any],
@@ -660,13 +707,7 @@ def _report(
     comment = _normalize_comment(payload)
 
     ins = conn.execute(
-        text(
-            """
-            INSERT INTO task_reports (task_id, report_link, submitted_by, current_comment, submitted_at)
-            VALUES (:tid, :link, :by, :comment, now())
-            RETURNING report_id
-            """
-        ),
+        _INSERT_REPORT_SQL,
         {"tid": int(task_id), "link": report_link, "by": int(actor_user_id), "comment": comment},
     ).mappings().first()
 
@@ -778,6 +819,42 @@ def _report(
     )
 
 
+_APPROVE_REPORT_SQL = text(
+    f"""
+    WITH rep AS (
+        UPDATE task_reports
+        SET approved_at = now(),
+            approved_by = :by,
+            {_apply_comment_sql()}
+        WHERE report_id = :rid
+        RETURNING approved_at
+    )
+    UPDATE tasks t
+    SET status_id = :sid
+    FROM rep
+    WHERE t.task_id = :tid
+    RETURNING rep.approved_at
+    """
+)
+
+
+_RETURN_FOR_REWORK_SQL = text(
+    f"""
+    WITH rep AS (
+        UPDATE task_reports
+        SET approved_at = NULL,
+            approved_by = NULL,
+            {_apply_comment_sql()}
+        WHERE report_id = :rid
+    )
+    UPDATE tasks
+    SET status_id = :sid,
+        executor_role_id = COALESCE(CAST(:performer_role_id AS bigint), executor_role_id)
+    WHERE task_id = :tid
+    """
+)
+
+
 def _approve(
     conn: Connection,
     task_row: Dict[str, Any],
@@ -813,30 +890,20 @@ def _approve(
 
     comment = _normalize_comment(payload)
 
+    # Report sign-off and the DONE status in one statement (status checked above).
     upd = conn.execute(
-        text(
-            f"""
-            UPDATE task_reports
-            SET approved_at = now(),
-                approved_by = :by,
-                {_apply_comment_sql()}
-            WHERE report_id = :rid
-            RETURNING approved_at
-            """
-        ),
-        {"by": int(actor_user_id), "rid": int(report_id), "comment": comment},
+        _APPROVE_REPORT_SQL,
+        {
+            "by": int(actor_user_id),
+            "rid": int(report_id),
+            "comment": comment,
+            "tid": int(task_id),
+            "sid": int(get_status_id_by_code(conn, "DONE")),
+        },
     ).mappings().first()
 
     approved_at = str(upd["approved_at"]) if upd and upd.get("approved_at") is not None else None
 
-    _set_status(
-        conn,
-        task_id,
-        from_status,
-        to_status="DONE",
-        allowed_from={"WAITING_APPROVAL"},
-    )
-
     write_task_audit(
         conn,
         task_id=int(task_id),
@@ -881,14 +948,6 @@ def _reject(
         rr = _get_latest_report_row(conn, task_id)
         report_id = int(rr["report_id"])
 
-        _set_status(
-            conn,
-            task_id,
-            from_status,
-            to_status="WAITING_REPORT",
-            allowed_from={"WAITING_APPROVAL"},
-        )
-
         # При возврате на доработку задача снова "висит" на исполнителе.
         # Для regular_tasks берём executor_role_id из regular_tasks.
         # Для adhoc/manual fallback = роль автора последнего отчёта.
@@ -913,21 +972,18 @@ def _reject(
             except Exception:
                 performer_role_id = None
 
-        if performer_role_id is not None:
-            _set_executor_role_if_needed(conn, task_id, performer_role_id)
-
-        comment = _normalize_comment(payload)
+        # Report reset, WAITING_REPORT and the executor role in one statement.
         conn.execute(
-            text(
-                f"""
-                UPDATE task_reports
-                SET approved_at = NULL,
-                    approved_by = NULL,
-                    {_apply_comment_sql()}
-                WHERE report_id = :rid
-                """
-            ),
-            {"rid": int(report_id), "comment": comment},
+            _RETURN_FOR_REWORK_SQL,
+            {
+                "rid": int(report_id),
+                "comment": _normalize_comment(payload),
+                "tid": int(task_id),
+                "sid": int(get_status_id_by_code(conn, "WAITING_REPORT")),
+                "performer_role_id": (
+                    int(performer_role_id) if performer_role_id is not None and int(performer_role_id) > 0 else None
+                ),
+            },
         )
 
         write_task_audit(
@@ -1,6 +1,9 @@
 # FILE: app/services/tasks_router.py
 from __future__ import annotations
 
+import os
+import time
+from functools import lru_cache
 from typing import Any, Dict, List, Literal, Optional
 
 from fastapi import APIRouter, HTTPException, Path, Query, Security
@@ -8,7 +11,8 @@ from fastapi.responses import Response
 from sqlalchemy import text
 
 from app.auth import get_current_user
-from app.db.engine import engine
+from app.core.json_response import RowsJSONResponse
+from app.db.engine import connect_autocommit, engine
 from app.errors import ErrorCode, raise_error
 from app.org_scope.apply import apply_org_scope
 from app.org_scope.resolver import task_effective_owner_unit_sql
@@ -24,11 +28,10 @@ from app.services.tasks_service import (
     get_status_id_by_code,
     get_team_scope_context,
     get_user_role_id,
-    load_assignment_scope_enum_labels,
     load_task_full,
     load_user_context,
     normalize_assignment_scope,
-    scope_label_or_none,
+    write_task_returning_full,
 )
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -108,6 +111,31 @@ def _normalize_status_filter(v: Optional[str]) -> Optional[str]:
     raise HTTPException(status_code=422, detail="status_filter must be one of: active, done, rejected")
 
 
+def _user_role_id(conn, user: Dict[str, Any]) -> int:
+    # The auth dependency has just read users.role_id for this request.
+    if "role_id" not in user:
+        return get_user_role_id(conn, int(user["user_id"]))
+    if user["role_id"] is None:
+        raise HTTPException(status_code=400, detail="User role_id is NULL")
+    return int(user["role_id"])
+
+
+def _user_role_and_unit(conn, user: Dict[str, Any]) -> tuple[int, Optional[int]]:
+    # get_current_user / require_bot_bound_user already read role_id and unit_id from
+    # users for this request; only hit the table again for callers that pass less.
+    if "role_id" in user and "unit_id" in user:
+        role_id = user.get("role_id")
+        unit_id = user.get("unit_id")
+    else:
+        user_ctx = load_user_context(conn, user_id=int(user["user_id"]))
+        role_id = user_ctx.get("role_id")
+        unit_id = user_ctx.get("unit_id")
+
+    if role_id is None:
+        raise HTTPException(status_code=400, detail="User role_id is NULL")
+    return int(role_id), (int(unit_id) if unit_id is not None else None)
+
+
 def _task_effective_org_unit_sql(task_alias: str = "t", regular_task_alias: str = "rt") -> str:
     return task_effective_owner_unit_sql(
         task_alias=task_alias,
@@ -115,18 +143,21 @@ def _task_effective_org_unit_sql(task_alias: str = "t", regular_task_alias: str
     )
 
 
+_USER_REPORTED_TASK_SQL = text(
+    """
+    SELECT 1
+    FROM public.task_reports r
+    WHERE r.task_id = :task_id
+      AND r.submitted_by = :user_id
+    LIMIT 1
+    """
+)
+
+
 def _user_reported_task(conn, task_id: int, user_id: int) -> bool:
     row = (
         conn.execute(
-            text(
-                """
-                SELECT 1
-                FROM public.task_reports r
-                WHERE r.task_id = :task_id
-                  AND r.submitted_by = :user_id
-                LIMIT 1
-                """
-            ),
+            _USER_REPORTED_TASK_SQL,
             {"task_id": int(task_id), "user_id": int(user_id)},
         )
         .mappings()
@@ -135,24 +166,27 @@ def _user_reported_task(conn, task_id: int, user_id: int) -> bool:
     return bool(row)
 
 
+_USER_IS_APPROVER_SQL = text(
+    """
+    SELECT 1
+    FROM public.tasks t
+    LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
+    LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
+    WHERE t.task_id = :task_id
+      AND COALESCE(ts.code,'') = 'WAITING_APPROVAL'
+      AND (
+            COALESCE(t.approver_user_id, 0) = :user_id
+            OR COALESCE(rt.target_role_id, 0) = :role_id
+      )
+    LIMIT 1
+    """
+)
+
+
 def _user_is_approver_for_task(conn, task_id: int, user_id: int, role_id: int) -> bool:
     row = (
         conn.execute(
-            text(
-                """
-                SELECT 1
-                FROM public.tasks t
-                LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
-                LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
-                WHERE t.task_id = :task_id
-                  AND COALESCE(ts.code,'') = 'WAITING_APPROVAL'
-                  AND (
-                        COALESCE(t.approver_user_id, 0) = :user_id
-                        OR COALESCE(rt.target_role_id, 0) = :role_id
-                  )
-                LIMIT 1
-                """
-            ),
+            _USER_IS_APPROVER_SQL,
             {"task_id": int(task_id), "user_id": int(user_id), "role_id": int(role_id)},
         )
         .mappings()
@@ -161,6 +195,231 @@ def _user_is_approver_for_task(conn, task_id: int, user_id: int, role_id: int) -
     return bool(row)
 
 
+# list_tasks SQL fragments are static; only the set of WHERE parts varies per request,
+# so identical filter shapes produce identical statement text (statement cache hits).
+_LIST_MINE_VISIBILITY_SQL = """
+(
+    (t.executor_role_id = :role_id)
+    OR EXISTS (
+        SELECT 1
+        FROM public.task_reports rr
+        WHERE rr.task_id = t.task_id
+          AND rr.submitted_by = :current_user_id
+    )
+    OR (
+        t.approver_user_id = :current_user_id
+        AND COALESCE(ts.code,'') = 'WAITING_APPROVAL'
+    )
+    OR (
+        EXISTS (
+            SELECT 1
+            FROM public.regular_tasks rt2
+            WHERE rt2.regular_task_id = t.regular_task_id
+              AND COALESCE(rt2.target_role_id, 0) = :role_id
+        )
+        AND COALESCE(ts.code,'') = 'WAITING_APPROVAL'
+    )
+)
+""".strip()
+
+_LIST_TEAM_UNIT_VISIBILITY_SQL = """
+EXISTS (
+    SELECT 1
+    FROM public.users ux
+    WHERE ux.role_id = t.executor_role_id
+      AND ux.unit_id = :current_unit_id
+      AND ux.user_id <> :current_user_id
+      AND COALESCE(ux.is_active, TRUE) = TRUE
+)
+""".strip()
+
+_LIST_POSITION_FILTER_SQL = """
+EXISTS (
+    SELECT 1
+    FROM public.users ux
+    INNER JOIN public.employees e ON e.employee_id = ux.employee_id
+    WHERE ux.role_id = t.executor_role_id
+      AND COALESCE(ux.is_active, TRUE) = TRUE
+      AND COALESCE(e.is_active, TRUE) = TRUE
+      AND e.position_id = :position_id
+)
+""".strip()
+
+# Every branch is a predicate on t: title/description can use the trigram
+# indexes, and the role/executor-name matches run once as uncorrelated
+# subqueries instead of a per-row EXISTS over users.
+_LIST_SEARCH_FILTER_SQL = """
+(
+    t.title ILIKE :q
+    OR t.description ILIKE :q
+    OR t.executor_role_id IN (
+        SELECT rq.role_id
+        FROM public.roles rq
+        WHERE rq.name ILIKE :q
+        UNION
+        SELECT ue.role_id
+        FROM public.users ue
+        WHERE COALESCE(ue.is_active, TRUE) = TRUE
+          AND ue.full_name ILIKE :q
+    )
+)
+""".strip()
+
+_LIST_STATUS_FILTER_SQL: Dict[str, str] = {
+    "active": "COALESCE(ts.code,'') IN ('IN_PROGRESS','WAITING_REPORT','WAITING_APPROVAL')",
+    "done": "COALESCE(ts.code,'') IN ('DONE')",
+    "rejected": "COALESCE(ts.code,'') IN ('REJECTED')",
+}
+
+_LIST_FILTER_FROM_SQL = """
+FROM public.tasks t
+LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
+LEFT JOIN public.roles er ON er.role_id = t.executor_role_id
+LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
+"""
+
+_LIST_COUNT_SQL = f"""
+SELECT COUNT(1)
+{_LIST_FILTER_FROM_SQL}"""
+
+_LIST_EFFECTIVE_ORG_UNIT_SQL = _task_effective_org_unit_sql("t", "rt")
+
+# Page ids and total come from one pass: COUNT(*) OVER () runs before LIMIT,
+# and the heavy LATERAL joins only touch the rows of the current page.
+_LIST_PAGE_HEAD_SQL = f"""
+SELECT
+    pg.total_count,
+    t.task_id,
+    t.period_id,
+    t.regular_task_id,
+    t.title,
+    t.description,
+    t.initiator_user_id,
+    t.created_by_user_id,
+    t.approver_user_id,
+    t.executor_role_id,
+    er.code AS executor_role_code,
+    er.name AS executor_role_name,
+    er.name AS executor_role_name_ru,
+    ex.executor_user_id,
+    ex.executor_name,
+    t.assignment_scope,
+    t.status_id,
+    t.task_kind,
+    t.requires_report,
+    t.requires_approval,
+    t.source_kind,
+    t.source_note,
+    t.due_date,
+    rt.schedule_type AS schedule_type,
+    ts.code AS status_code,
+    ts.name_ru AS status_name_ru,
+    {_LIST_EFFECTIVE_ORG_UNIT_SQL} AS org_unit_id,
+    ou.name AS org_unit_name,
+
+    tr.report_link AS report_link,
+    tr.submitted_at AS report_submitted_at,
+    tr.submitted_by AS report_submitted_by,
+    tr.submitted_by_role_name AS report_submitted_by_role_name,
+    tr.submitted_by_role_code AS report_submitted_by_role_code,
+
+    tr.approved_at AS report_approved_at,
+    tr.approved_by AS report_approved_by,
+    tr.current_comment AS report_current_comment
+FROM (
+    SELECT
+        t.task_id,
+        COUNT(*) OVER () AS total_count
+    {_LIST_FILTER_FROM_SQL}
+"""
+
+_LIST_PAGE_TAIL_SQL = f"""
+    ORDER BY t.task_id DESC
+    LIMIT :limit OFFSET :offset
+) pg
+JOIN public.tasks t ON t.task_id = pg.task_id
+LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
+LEFT JOIN public.roles er ON er.role_id = t.executor_role_id
+LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
+LEFT JOIN public.org_units ou ON ou.unit_id = {_LIST_EFFECTIVE_ORG_UNIT_SQL}
+LEFT JOIN LATERAL (
+    SELECT
+        ue.user_id AS executor_user_id,
+        ue.full_name AS executor_name
+    FROM public.users ue
+    WHERE ue.role_id = t.executor_role_id
+      AND COALESCE(ue.is_active, TRUE) = TRUE
+    ORDER BY
+        CASE WHEN ue.user_id = :current_user_id THEN 0 ELSE 1 END,
+        CASE
+            WHEN :current_unit_id IS NOT NULL AND ue.unit_id = :current_unit_id THEN 0
+            ELSE 1
+        END,
+        ue.user_id
+    LIMIT 1
+) ex ON TRUE
+LEFT JOIN LATERAL (
+    SELECT
+        r.report_link,
+        r.submitted_at,
+        r.submitted_by,
+        rs.name AS submitted_by_role_name,
+        rs.code AS submitted_by_role_code,
+        r.approved_at,
+        r.approved_by,
+        r.current_comment
+    FROM public.task_reports r
+    LEFT JOIN public.users us ON us.user_id = r.submitted_by
+    LEFT JOIN public.roles rs ON rs.role_id = us.role_id
+    WHERE r.task_id = t.task_id
+    ORDER BY
+        r.submitted_at DESC NULLS LAST,
+        r.approved_at  DESC NULLS LAST,
+        r.report_id    DESC
+    LIMIT 1
+) tr ON TRUE
+ORDER BY t.task_id DESC
+"""
+
+
+@lru_cache(maxsize=256)
+def _list_sql(sql: str):
+    # The list query is assembled from fixed fragments, so the number of distinct
+    # strings is bounded by the filter combinations; reusing the TextClause skips
+    # re-scanning the SQL for bind params and gives SQLAlchemy a stable cache key.
+    return text(sql)
+
+
+# Optional short-lived cache of list_tasks responses for polling dashboards.
+# Off by default (TTL 0). Entries are per caller (user, role, unit) and filter
+# set; any task write through this router drops the whole cache, and writes
+# from other processes or the scheduler become visible within the TTL.
+_LIST_CACHE_TTL_S = max(0.0, float(os.getenv("TASKS_LIST_CACHE_TTL_S", "0") or 0))
+_LIST_CACHE_MAX_ENTRIES = 2048
+_LIST_CACHE: Dict[tuple, tuple[float, Dict[str, Any]]] = {}
+
+
+def _invalidate_list_cache() -> None:
+    _LIST_CACHE.clear()
+
+
+def _list_cache_get(key: tuple) -> Optional[Dict[str, Any]]:
+    if _LIST_CACHE_TTL_S <= 0:
+        return None
+    hit = _LIST_CACHE.get(key)
+    if hit is None or hit[0] < time.monotonic():
+        return None
+    return hit[1]
+
+
+def _list_cache_put(key: tuple, body: Dict[str, Any]) -> None:
+    if _LIST_CACHE_TTL_S <= 0:
+        return
+    if len(_LIST_CACHE) >= _LIST_CACHE_MAX_ENTRIES:
+        _LIST_CACHE.clear()
+    _LIST_CACHE[key] = (time.monotonic() + _LIST_CACHE_TTL_S, body)
+
+
 @router.get("")
 @router.get("/")
 def list_tasks(
@@ -199,9 +458,39 @@ def list_tasks(
     ),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[int] = Query(
+        None,
+        ge=1,
+        description="Keyset pagination: return tasks with task_id < cursor (use next_cursor from the previous page). "
+        "With a cursor, total counts the remaining rows only.",
+    ),
     user: Dict[str, Any] = Security(get_current_user),
-) -> Dict[str, Any]:
+) -> RowsJSONResponse:
     current_user_id = int(user["user_id"])
+    cache_key = (
+        current_user_id,
+        user.get("role_id"),
+        user.get("unit_id"),
+        period_id,
+        status_code,
+        status_filter,
+        search,
+        include_archived,
+        scope,
+        executor_role_id,
+        org_unit_id,
+        org_group_id,
+        position_id,
+        assignment_scope,
+        task_kind,
+        limit,
+        offset,
+        cursor,
+    )
+    cached = _list_cache_get(cache_key)
+    if cached is not None:
+        return RowsJSONResponse(cached)
+
     params: Dict[str, Any] = {
         "limit": int(limit),
         "offset": int(offset),
@@ -210,61 +499,18 @@ def list_tasks(
 
     sf = _normalize_status_filter(status_filter)
 
-    with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
-        user_ctx = load_user_context(conn, user_id=int(current_user_id))
-        current_unit_id = int(user_ctx["unit_id"]) if user_ctx.get("unit_id") is not None else None
+    with connect_autocommit() as conn:
+        role_id, current_unit_id = _user_role_and_unit(conn, user)
 
         params["role_id"] = int(role_id)
         params["current_unit_id"] = current_unit_id
 
         is_system_admin = _is_system_admin_role_id(role_id)
 
-        allowed = load_assignment_scope_enum_labels(conn)
-        if not allowed:
-            raise HTTPException(status_code=500, detail="assignment_scope_t enum not found in DB")
-
-        functional_lbl = scope_label_or_none(allowed, "functional")
-        admin_lbl = scope_label_or_none(allowed, "admin")
-        _ = functional_lbl, admin_lbl
-
-        report_visibility = """
-            EXISTS (
-                SELECT 1
-                FROM public.task_reports rr
-                WHERE rr.task_id = t.task_id
-                  AND rr.submitted_by = :current_user_id
-            )
-        """.strip()
-
-        explicit_approver_visibility = """
-            COALESCE(t.approver_user_id, 0) = :current_user_id
-            AND COALESCE(ts.code,'') = 'WAITING_APPROVAL'
-        """.strip()
-
-        legacy_approver_visibility = """
-            EXISTS (
-                SELECT 1
-                FROM public.regular_tasks rt2
-                WHERE rt2.regular_task_id = t.regular_task_id
-                  AND COALESCE(rt2.target_role_id, 0) = :role_id
-            )
-            AND COALESCE(ts.code,'') = 'WAITING_APPROVAL'
-        """.strip()
-
-        effective_org_unit_sql = _task_effective_org_unit_sql("t", "rt")
-
         where: List[str] = []
 
         if scope == "mine":
-            where.append(
-                "("
-                "(t.executor_role_id = :role_id) "
-                f"OR ({report_visibility}) "
-                f"OR ({explicit_approver_visibility}) "
-                f"OR ({legacy_approver_visibility})"
-                ")"
-            )
+            where.append(_LIST_MINE_VISIBILITY_SQL)
         elif not is_system_admin:
             team_ctx = get_team_scope_context(
                 conn,
@@ -280,18 +526,7 @@ def list_tasks(
                     params["team_executor_role_ids"] = [int(x) for x in team_role_ids]
             else:
                 params["current_unit_id"] = team_ctx.get("current_unit_id")
-                where.append(
-                    """
-                    EXISTS (
-                        SELECT 1
-                        FROM public.users ux
-                        WHERE ux.role_id = t.executor_role_id
-                          AND ux.unit_id = :current_unit_id
-                          AND ux.user_id <> :current_user_id
-                          AND COALESCE(ux.is_active, TRUE) = TRUE
-                    )
-                    """.strip()
-                )
+                where.append(_LIST_TEAM_UNIT_VISIBILITY_SQL)
         # System admin + scope=team: no visibility filter — true "all tasks" list.
 
         if scope == "team" and executor_role_id is not None:
@@ -300,19 +535,7 @@ def list_tasks(
             params["executor_role_id"] = erid
 
         if scope == "team" and position_id is not None:
-            where.append(
-                """
-                EXISTS (
-                    SELECT 1
-                    FROM public.users ux
-                    INNER JOIN public.employees e ON e.employee_id = ux.employee_id
-                    WHERE ux.role_id = t.executor_role_id
-                      AND COALESCE(ux.is_active, TRUE) = TRUE
-                      AND COALESCE(e.is_active, TRUE) = TRUE
-                      AND e.position_id = :position_id
-                )
-                """.strip()
-            )
+            where.append(_LIST_POSITION_FILTER_SQL)
             params["position_id"] = int(position_id)
 
         scope_prefix = ""
@@ -339,15 +562,10 @@ def list_tasks(
             where.append("ts.code = :status_code")
             params["status_code"] = status_code.strip()
         else:
-            if sf == "active":
-                where.append("COALESCE(ts.code,'') IN ('IN_PROGRESS','WAITING_REPORT','WAITING_APPROVAL')")
-            elif sf == "done":
-                where.append("COALESCE(ts.code,'') IN ('DONE')")
-            elif sf == "rejected":
-                where.append("COALESCE(ts.code,'') IN ('REJECTED')")
-            else:
-                if not include_archived:
-                    where.append("COALESCE(ts.code,'') <> 'ARCHIVED'")
+            if sf:
+                where.append(_LIST_STATUS_FILTER_SQL[sf])
+            elif not include_archived:
+                where.append("COALESCE(ts.code,'') <> 'ARCHIVED'")
 
         scope_raw = (assignment_scope or "").strip().lower()
         if scope_raw and scope_raw != "all":
@@ -365,138 +583,47 @@ def list_tasks(
         if search:
             q = search.strip()
             if q:
-                where.append(
-                    """
-                    (
-                        t.title ILIKE :q
-                        OR COALESCE(t.description,'') ILIKE :q
-                        OR COALESCE(er.name,'') ILIKE :q
-                        OR EXISTS (
-                            SELECT 1
-                            FROM public.users ue
-                            WHERE ue.role_id = t.executor_role_id
-                              AND COALESCE(ue.is_active, TRUE) = TRUE
-                              AND COALESCE(ue.full_name, '') ILIKE :q
-                        )
-                    )
-                    """.strip()
-                )
+                where.append(_LIST_SEARCH_FILTER_SQL)
                 params["q"] = f"%{q}%"
 
+        if cursor is not None:
+            where.append("t.task_id < :cursor")
+            params["cursor"] = int(cursor)
+
         where_sql = " AND ".join(where) if where else "1=1"
 
-        count_text = f"""
-            {scope_prefix}
-            SELECT COUNT(1)
-            FROM public.tasks t
-            LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
-            LEFT JOIN public.roles er ON er.role_id = t.executor_role_id
-            LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
-            WHERE {where_sql}
-        """
-
-        select_text = f"""
-            {scope_prefix}
-            SELECT
-                t.task_id,
-                t.period_id,
-                t.regular_task_id,
-                t.title,
-                t.description,
-                t.initiator_user_id,
-                t.created_by_user_id,
-                t.approver_user_id,
-                t.executor_role_id,
-                er.code AS executor_role_code,
-                er.name AS executor_role_name,
-                er.name AS executor_role_name_ru,
-                ex.executor_user_id,
-                ex.executor_name,
-                t.assignment_scope,
-                t.status_id,
-                t.task_kind,
-                t.requires_report,
-                t.requires_approval,
-                t.source_kind,
-                t.source_note,
-                t.due_date,
-                rt.schedule_type AS schedule_type,
-                ts.code AS status_code,
-                ts.name_ru AS status_name_ru,
-                {effective_org_unit_sql} AS org_unit_id,
-                ou.name AS org_unit_name,
-
-                tr.report_link AS report_link,
-                tr.submitted_at AS report_submitted_at,
-                tr.submitted_by AS report_submitted_by,
-                tr.submitted_by_role_name AS report_submitted_by_role_name,
-                tr.submitted_by_role_code AS report_submitted_by_role_code,
-
-                tr.approved_at AS report_approved_at,
-                tr.approved_by AS report_approved_by,
-                tr.current_comment AS report_current_comment
-            FROM public.tasks t
-            LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
-            LEFT JOIN public.roles er ON er.role_id = t.executor_role_id
-            LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
-            LEFT JOIN public.org_units ou ON ou.unit_id = {effective_org_unit_sql}
-            LEFT JOIN LATERAL (
-                SELECT
-                    ue.user_id AS executor_user_id,
-                    ue.full_name AS executor_name
-                FROM public.users ue
-                WHERE ue.role_id = t.executor_role_id
-                  AND COALESCE(ue.is_active, TRUE) = TRUE
-                ORDER BY
-                    CASE WHEN ue.user_id = :current_user_id THEN 0 ELSE 1 END,
-                    CASE
-                        WHEN :current_unit_id IS NOT NULL AND ue.unit_id = :current_unit_id THEN 0
-                        ELSE 1
-                    END,
-                    ue.user_id
-                LIMIT 1
-            ) ex ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT
-                    r.report_link,
-                    r.submitted_at,
-                    r.submitted_by,
-                    rs.name AS submitted_by_role_name,
-                    rs.code AS submitted_by_role_code,
-                    r.approved_at,
-                    r.approved_by,
-                    r.current_comment
-                FROM public.task_reports r
-                LEFT JOIN public.users us ON us.user_id = r.submitted_by
-                LEFT JOIN public.roles rs ON rs.role_id = us.role_id
-                WHERE r.task_id = t.task_id
-                ORDER BY
-                    r.submitted_at DESC NULLS LAST,
-                    r.approved_at  DESC NULLS LAST,
-                    r.report_id    DESC
-                LIMIT 1
-            ) tr ON TRUE
-            WHERE {where_sql}
-            ORDER BY t.task_id DESC
-            LIMIT :limit OFFSET :offset
-        """
-
-        total = int(conn.execute(text(count_text), params).scalar() or 0)
-        rows = conn.execute(text(select_text), params).mappings().all()
+        count_text = f"{scope_prefix}{_LIST_COUNT_SQL}WHERE {where_sql}"
+        select_text = (
+            f"{scope_prefix}{_LIST_PAGE_HEAD_SQL}"
+            f"WHERE {where_sql}{_LIST_PAGE_TAIL_SQL}"
+        )
+
+        rows = conn.execute(_list_sql(select_text), params).mappings().all()
+        if rows:
+            total = int(rows[0]["total_count"] or 0)
+        elif offset > 0:
+            # Page past the end: the window has no row to report the total on.
+            total = int(conn.execute(_list_sql(count_text), params).scalar() or 0)
+        else:
+            total = 0
 
+        # attach_allowed_actions copies the RowMapping into the one dict we return.
         items: List[Dict[str, Any]] = []
         for r in rows:
-            t = dict(r)
-            t = attach_allowed_actions(task=t, current_user_id=current_user_id, current_role_id=role_id)
+            t = attach_allowed_actions(task=r, current_user_id=current_user_id, current_role_id=role_id)
+            t.pop("total_count", None)
             items.append(t)
 
-    return {
+    body = {
         "scope": scope,
         "total": int(total),
         "limit": int(limit),
         "offset": int(offset),
+        "next_cursor": int(items[-1]["task_id"]) if len(items) == int(limit) else None,
         "items": items,
     }
+    _list_cache_put(cache_key, body)
+    return RowsJSONResponse(body)
 
 
 @router.get("/manual/available-roles")
@@ -506,7 +633,7 @@ def get_manual_task_available_roles(
 ) -> Dict[str, Any]:
     current_user_id = int(user["user_id"])
 
-    with engine.begin() as conn:
+    with connect_autocommit() as conn:
         result = get_manual_task_role_options_for_user(conn, current_user_id=int(current_user_id))
 
     return {
@@ -524,8 +651,8 @@ def get_task(
 ) -> Dict[str, Any]:
     current_user_id = int(user["user_id"])
 
-    with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
+    with connect_autocommit() as conn:
+        role_id = _user_role_id(conn, user)
 
         task = load_task_full(conn, task_id=int(task_id))
 
@@ -558,7 +685,7 @@ def get_task(
 
         task = attach_allowed_actions(task=task, current_user_id=current_user_id, current_role_id=role_id)
 
-    return dict(task)
+    return task
 
 
 @router.post("/manual")
@@ -568,7 +695,7 @@ def create_manual_task(
 ) -> Dict[str, Any]:
     current_user_id = int(user["user_id"])
 
-    title = (payload.get("title") or "").strip()
+    title = _pick_str(payload, ["title"])
     if not title:
         raise HTTPException(status_code=422, detail="title is required")
 
@@ -604,9 +731,9 @@ def create_manual_task(
 
         initiator_user_id = int(current_user_id)
 
-        row = conn.execute(
-            text(
-                """
+        task = write_task_returning_full(
+            conn,
+            write_sql="""
                 INSERT INTO public.tasks (
                     period_id,
                     regular_task_id,
@@ -646,10 +773,9 @@ def create_manual_task(
                         ELSE (:due_date)::date
                     END
                 )
-                RETURNING task_id
-                """
-            ),
-            {
+                RETURNING *
+            """,
+            params={
                 "period_id": int(period_id),
                 "title": title,
                 "description": description,
@@ -664,18 +790,16 @@ def create_manual_task(
                 "source_note": source_note,
                 "due_date": due_date,
             },
-        ).mappings().first()
+        )
 
-        if not row or row.get("task_id") is None:
+        if not task or task.get("task_id") is None:
             raise HTTPException(status_code=500, detail="Failed to create manual task")
 
-        task_id = int(row["task_id"])
-        role_id = get_user_role_id(conn, current_user_id)
-
-        task = load_task_full(conn, task_id=task_id)
+        role_id = _user_role_id(conn, user)
         task = attach_allowed_actions(task=task, current_user_id=current_user_id, current_role_id=role_id)
 
-    return dict(task)
+    _invalidate_list_cache()
+    return task
 
 
 @router.post("/")
@@ -685,7 +809,7 @@ def create_task(
 ) -> Dict[str, Any]:
     current_user_id = int(user["user_id"])
 
-    title = (payload.get("title") or "").strip()
+    title = _pick_str(payload, ["title"])
     if not title:
         raise HTTPException(status_code=422, detail="title is required")
 
@@ -738,9 +862,9 @@ def create_task(
         assignment_scope = normalize_assignment_scope(conn, payload.get("assignment_scope"))
         status_id = get_status_id_by_code(conn, status_code)
 
-        row = conn.execute(
-            text(
-                """
+        task = write_task_returning_full(
+            conn,
+            write_sql="""
                 INSERT INTO public.tasks (
                     period_id,
                     regular_task_id,
@@ -780,10 +904,9 @@ def create_task(
                         ELSE (:due_date)::date
                     END
                 )
-                RETURNING task_id
-                """
-            ),
-            {
+                RETURNING *
+            """,
+            params={
                 "period_id": int(period_id),
                 "regular_task_id": int(regular_task_id) if regular_task_id is not None else None,
                 "title": title,
@@ -801,18 +924,16 @@ def create_task(
                 "source_note": source_note,
                 "due_date": due_date,
             },
-        ).mappings().first()
+        )
 
-        if not row or row.get("task_id") is None:
+        if not task or task.get("task_id") is None:
             raise HTTPException(status_code=500, detail="Failed to create task")
 
-        task_id = int(row["task_id"])
-        role_id = get_user_role_id(conn, current_user_id)
-
-        task = load_task_full(conn, task_id=task_id)
+        role_id = _user_role_id(conn, user)
         task = attach_allowed_actions(task=task, current_user_id=current_user_id, current_role_id=role_id)
 
-    return dict(task)
+    _invalidate_list_cache()
+    return task
 
 
 @router.post("/{task_id}/report")
@@ -823,7 +944,7 @@ def submit_report(
 ) -> Dict[str, Any]:
     current_user_id = int(user["user_id"])
 
-    report_link = (payload.get("report_link") or "").strip()
+    report_link = _pick_str(payload, ["report_link"])
     if not report_link:
         raise HTTPException(status_code=422, detail="report_link is required")
 
@@ -831,7 +952,7 @@ def submit_report(
     reason = _pick_str(payload, ["reason"])
 
     with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
+        role_id = _user_role_id(conn, user)
 
         task = load_task_full(conn, task_id=int(task_id))
         task = ensure_task_visible_or_404(
@@ -852,12 +973,14 @@ def submit_report(
             actor_user_id=int(current_user_id),
             actor_role_id=int(role_id),
             payload={"report_link": report_link, "current_comment": current_comment, "reason": reason},
+            task_row=task,
         )
 
         updated = load_task_full(conn, task_id=int(task_id))
         updated = attach_allowed_actions(task=updated, current_user_id=current_user_id, current_role_id=role_id)
 
-    return dict(updated)
+    _invalidate_list_cache()
+    return updated
 
 
 @router.post("/{task_id}/approve")
@@ -875,7 +998,7 @@ def approve_report(
     current_comment = _pick_str(payload, ["current_comment", "comment"])
 
     with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
+        role_id = _user_role_id(conn, user)
 
         task = load_task_full(conn, task_id=int(task_id))
         try:
@@ -910,12 +1033,14 @@ def approve_report(
             actor_user_id=int(current_user_id),
             actor_role_id=int(role_id),
             payload={"reason": reason, "current_comment": current_comment},
+            task_row=task,
         )
 
         updated = load_task_full(conn, task_id=int(task_id))
         updated = attach_allowed_actions(task=updated, current_user_id=current_user_id, current_role_id=role_id)
 
-    return dict(updated)
+    _invalidate_list_cache()
+    return updated
 
 
 @router.post("/{task_id}/reject")
@@ -930,7 +1055,7 @@ def reject_report(
     current_comment = _pick_str(payload, ["current_comment", "comment"])
 
     with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
+        role_id = _user_role_id(conn, user)
 
         task = load_task_full(conn, task_id=int(task_id))
         try:
@@ -965,12 +1090,14 @@ def reject_report(
             actor_user_id=int(current_user_id),
             actor_role_id=int(role_id),
             payload={"reason": reason, "current_comment": current_comment},
+            task_row=task,
         )
 
         updated = load_task_full(conn, task_id=int(task_id))
         updated = attach_allowed_actions(task=updated, current_user_id=current_user_id, current_role_id=role_id)
 
-    return dict(updated)
+    _invalidate_list_cache()
+    return updated
 
 
 @router.post("/{task_id}/archive")
@@ -985,7 +1112,7 @@ def archive_task(
     current_comment = _pick_str(payload, ["current_comment", "comment"])
 
     with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
+        role_id = _user_role_id(conn, user)
 
         task = load_task_full(conn, task_id=int(task_id))
         task = ensure_task_visible_or_404(
@@ -1006,12 +1133,46 @@ def archive_task(
             actor_user_id=int(current_user_id),
             actor_role_id=int(role_id),
             payload={"reason": reason, "current_comment": current_comment},
+            task_row=task,
         )
 
         updated = load_task_full(conn, task_id=int(task_id))
         updated = attach_allowed_actions(task=updated, current_user_id=current_user_id, current_role_id=role_id)
 
-    return dict(updated)
+    _invalidate_list_cache()
+    return updated
+
+
+_PATCH_TASK_FIELDS = frozenset(
+    {
+        "title",
+        "description",
+        "source_note",
+        "due_date",
+        "due_at",
+        "approver_user_id",
+        "requires_report",
+        "requires_approval",
+        "executor_role_id",
+        "assignment_scope",
+    }
+)
+
+_PATCH_GUARD_SQL = text(
+    """
+    SELECT
+        t.task_id,
+        t.initiator_user_id,
+        t.approver_user_id,
+        t.task_kind,
+        t.source_kind,
+        ts.code AS status_code
+    FROM public.tasks t
+    LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
+    WHERE t.task_id = :task_id
+    FOR UPDATE OF t
+    """
+)
 
 
 @router.patch("/{task_id}")
@@ -1022,18 +1183,22 @@ def patch_task(
 ) -> Dict[str, Any]:
     current_user_id = int(user["user_id"])
 
+    unknown = payload.keys() - _PATCH_TASK_FIELDS
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
     with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
+        role_id = _user_role_id(conn, user)
 
-        task = load_task_full(conn, task_id=int(task_id))
-        task = ensure_task_visible_or_404(
-            conn=conn,
-            current_user_id=current_user_id,
-            current_role_id=role_id,
-            task_row=task,
-            include_archived=False,
-        )
+        # Only the columns the checks below need; the full projection comes back
+        # from the UPDATE itself. Locking the row keeps the checks valid until then.
+        task = conn.execute(_PATCH_GUARD_SQL, {"task_id": int(task_id)}).mappings().first()
+        if not task or str(task.get("status_code") or "") == "ARCHIVED":
+            raise HTTPException(status_code=404, detail="Task not found")
 
+        # Only admins and the initiator may edit, and both always pass the visibility
+        # check, so the full ensure_task_visible_or_404 walk (team scope, reports,
+        # approvers) would only add queries before the same 404.
         is_admin = _is_system_admin_role_id(role_id)
         is_initiator = int(task.get("initiator_user_id") or 0) == int(current_user_id)
 
@@ -1138,33 +1303,66 @@ def patch_task(
             params["assignment_scope"] = assignment_scope
 
         if not sets:
-            updated = load_task_full(conn, task_id=int(task_id))
             updated = attach_allowed_actions(
-                task=updated,
+                task=load_task_full(conn, task_id=int(task_id)),
                 current_user_id=current_user_id,
                 current_role_id=role_id,
             )
-            return dict(updated)
+            return updated
 
-        conn.execute(
-            text(
-                f"""
+        updated = write_task_returning_full(
+            conn,
+            write_sql=f"""
                 UPDATE public.tasks
                 SET {", ".join(sets)}
                 WHERE task_id = :task_id
-                """
-            ),
-            params,
+                RETURNING *
+            """,
+            params=params,
         )
-
-        updated = load_task_full(conn, task_id=int(task_id))
+        if updated is None:
+            raise HTTPException(status_code=404, detail="Task not found")
         updated = attach_allowed_actions(
             task=updated,
             current_user_id=current_user_id,
             current_role_id=role_id,
         )
 
-    return dict(updated)
+    _invalidate_list_cache()
+    return updated
+
+
+# Data-modifying CTEs run in one statement against one snapshot; the FKs
+# cascade anyway, the explicit deletes keep this independent of that.
+_HARD_DELETE_TASK_SQL = text(
+    """
+    WITH ev AS (
+        SELECT e.audit_id
+        FROM public.task_events e
+        WHERE e.task_id = :task_id
+    ),
+    del_deliveries AS (
+        DELETE FROM public.task_event_deliveries
+        WHERE audit_id IN (SELECT audit_id FROM ev)
+    ),
+    del_recipients AS (
+        DELETE FROM public.task_event_recipients
+        WHERE audit_id IN (SELECT audit_id FROM ev)
+    ),
+    del_reports AS (
+        DELETE FROM public.task_reports WHERE task_id = :task_id
+    ),
+    del_audit AS (
+        DELETE FROM public.task_audit_log WHERE task_id = :task_id
+    ),
+    del_events AS (
+        DELETE FROM public.task_events WHERE task_id = :task_id
+    )
+    DELETE FROM public.tasks
+    WHERE task_id = :task_id
+    RETURNING task_id
+    """
+)
 
 
 @router.delete("/{task_id}", status_code=204)
@@ -1176,75 +1374,39 @@ def delete_task(
     current_user_id = int(user["user_id"])
 
     with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
-
-        task = load_task_full(conn, task_id=int(task_id))
-        task = ensure_task_visible_or_404(
-            conn=conn,
-            current_user_id=current_user_id,
-            current_role_id=role_id,
-            task_row=task,
-            include_archived=True,
-        )
+        role_id = _user_role_id(conn, user)
+
+        if hard and _is_system_admin_role_id(role_id):
+            # ADMIN sees every task, so no visibility walk: one statement removes
+            # the task with its events/reports/audit, RETURNING tells us it existed.
+            deleted = conn.execute(_HARD_DELETE_TASK_SQL, {"task_id": int(task_id)}).first()
+            if deleted is None:
+                raise HTTPException(status_code=404, detail="Task not found")
+        else:
+            task = load_task_full(conn, task_id=int(task_id))
+            task = ensure_task_visible_or_404(
+                conn=conn,
+                current_user_id=current_user_id,
+                current_role_id=role_id,
+                task_row=task,
+                include_archived=True,
+            )
 
-        if hard:
-            if not _is_system_admin_role_id(role_id):
+            if hard:
                 raise HTTPException(status_code=403, detail="Only ADMIN can hard-delete tasks")
 
-            conn.execute(
-                text(
-                    """
-                    DELETE FROM public.task_event_deliveries
-                    WHERE audit_id IN (
-                        SELECT e.audit_id
-                        FROM public.task_events e
-                        WHERE e.task_id = :task_id
-                    )
-                    """
-                ),
-                {"task_id": int(task_id)},
-            )
-            conn.execute(
-                text(
-                    """
-                    DELETE FROM public.task_event_recipients
-                    WHERE audit_id IN (
-                        SELECT e.audit_id
-                        FROM public.task_events e
-                        WHERE e.task_id = :task_id
-                    )
-                    """
-                ),
-                {"task_id": int(task_id)},
-            )
-            conn.execute(
-                text("DELETE FROM public.task_reports WHERE task_id = :task_id"),
-                {"task_id": int(task_id)},
-            )
-            conn.execute(
-                text("DELETE FROM public.task_audit_log WHERE task_id = :task_id"),
-                {"task_id": int(task_id)},
-            )
-            conn.execute(
-                text("DELETE FROM public.task_events WHERE task_id = :task_id"),
-                {"task_id": int(task_id)},
-            )
-            conn.execute(
-                text("DELETE FROM public.tasks WHERE task_id = :task_id"),
-                {"task_id": int(task_id)},
-            )
-            return Response(status_code=204)
+            if (not _is_system_admin_role_id(role_id)) and int(task.get("initiator_user_id") or 0) != int(current_user_id):
+                raise HTTPException(status_code=404, detail="Task not found")
 
-        if (not _is_system_admin_role_id(role_id)) and int(task.get("initiator_user_id") or 0) != int(current_user_id):
-            raise HTTPException(status_code=404, detail="Task not found")
-
-        transition(
-            conn=conn,
-            task_id=int(task_id),
-            action="archive",
-            actor_user_id=int(current_user_id),
-            actor_role_id=int(role_id),
-            payload={},
-        )
+            transition(
+                conn=conn,
+                task_id=int(task_id),
+                action="archive",
+                actor_user_id=int(current_user_id),
+                actor_role_id=int(role_id),
+                payload={},
+                task_row=task,
+            )
 
+    _invalidate_list_cache()
     return Response(status_code=204)
\ No newline at end of file
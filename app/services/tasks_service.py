@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List, Optional, Set
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
 
 from fastapi import HTTPException
 from sqlalchemy import bindparam, text
@@ -42,6 +44,7 @@ def parse_int_set_env(name: str) -> Set[int]:
 SUPERVISOR_ROLE_IDS: Set[int] = parse_int_set_env("SUPERVISOR_ROLE_IDS")
 DEPUTY_ROLE_IDS: Set[int] = parse_int_set_env("DEPUTY_ROLE_IDS")
 DIRECTOR_ROLE_IDS: Set[int] = parse_int_set_env("DIRECTOR_ROLE_IDS")
+MANAGEMENT_ROLE_IDS: FrozenSet[int] = frozenset(DIRECTOR_ROLE_IDS | DEPUTY_ROLE_IDS | SUPERVISOR_ROLE_IDS)
 
 
 def is_system_admin_role_id(role_id: Any) -> bool:
@@ -63,28 +66,43 @@ def get_current_user_id(x_user_id: Optional[int]) -> int:
     return uid
 
 
+# Invariant lookups run on most requests: build their TextClause once.
+_USER_ROLE_SQL = text("SELECT role_id FROM users WHERE user_id = :uid")
+
+_ROLE_META_SQL = text(
+    """
+    SELECT role_id, code, name
+    FROM public.roles
+    WHERE role_id = :rid
+    """
+)
+
+_USER_CONTEXT_SQL = text(
+    """
+    SELECT
+        u.user_id,
+        u.role_id,
+        u.unit_id,
+        u.full_name,
+        u.login,
+        u.is_active
+    FROM public.users u
+    WHERE u.user_id = :uid
+    """
+)
+
+
 def get_user_role_id(conn, user_id: int) -> int:
-    row = conn.execute(
-        text("SELECT user_id, role_id FROM users WHERE user_id = :uid"),
-        {"uid": int(user_id)},
-    ).mappings().first()
-    if not row:
+    # Plain row, not a mapping: no row -> 404, NULL role -> 400.
+    row = conn.execute(_USER_ROLE_SQL, {"uid": int(user_id)}).first()
+    if row is None:
         raise HTTPException(status_code=404, detail="User not found")
-    if row["role_id"] is None:
+    if row[0] is None:
         raise HTTPException(status_code=400, detail="User role_id is NULL")
-    return int(row["role_id"])
+    return int(row[0])
 
 def load_role_meta(conn, *, role_id: int) -> Dict[str, Any]:
-    row = conn.execute(
-        text(
-            """
-            SELECT role_id, code, name
-            FROM public.roles
-            WHERE role_id = :rid
-            """
-        ),
-        {"rid": int(role_id)},
-    ).mappings().first()
+    row = conn.execute(_ROLE_META_SQL, {"rid": int(role_id)}).mappings().first()
 
     if not row:
         return {
@@ -129,22 +147,7 @@ def _looks_like_manager_role(*, role_code: Any, role_name: Any) -> bool:
     return False
 
 def load_user_context(conn, *, user_id: int) -> Dict[str, Any]:
-    row = conn.execute(
-        text(
-            """
-            SELECT
-                u.user_id,
-                u.role_id,
-                u.unit_id,
-                u.full_name,
-                u.login,
-                u.is_active
-            FROM public.users u
-            WHERE u.user_id = :uid
-            """
-        ),
-        {"uid": int(user_id)},
-    ).mappings().first()
+    row = conn.execute(_USER_CONTEXT_SQL, {"uid": int(user_id)}).mappings().first()
 
     if not row:
         raise HTTPException(status_code=404, detail="User not found")
@@ -152,6 +155,32 @@ def load_user_context(conn, *, user_id: int) -> Dict[str, Any]:
     return dict(row)
 
 
+# task_statuses is a tiny reference table that only changes with migrations:
+# keep code -> status_id in process and reload the whole table on a miss.
+# Caches are swapped in whole (never mutated in place), so concurrent readers
+# in the threadpool see either the old or the new map and need no lock.
+_STATUS_ID_BY_CODE: Mapping[str, int] = MappingProxyType({})
+_ALL_STATUS_IDS_SQL = text("SELECT code, status_id FROM task_statuses")
+
+
+def reset_status_id_cache() -> None:
+    global _STATUS_ID_BY_CODE
+    _STATUS_ID_BY_CODE = MappingProxyType({})
+
+
+def _reload_status_ids(conn) -> None:
+    global _STATUS_ID_BY_CODE
+    rows = conn.execute(_ALL_STATUS_IDS_SQL).all()
+    fresh = {str(code).strip().upper(): int(status_id) for code, status_id in rows if code is not None}
+    _STATUS_ID_BY_CODE = MappingProxyType(fresh)
+
+
+def warm_reference_caches(conn) -> None:
+    """Fill the task status and assignment_scope caches up front (app startup)."""
+    _reload_status_ids(conn)
+    load_assignment_scope_enum_labels(conn)
+
+
 def get_status_id_by_code(conn, code: str) -> int:
     if code is None:
         raise HTTPException(status_code=400, detail="Unknown status code: None")
@@ -160,79 +189,87 @@ def get_status_id_by_code(conn, code: str) -> int:
     if not normalized:
         raise HTTPException(status_code=400, detail="Unknown status code: ''")
 
-    row = conn.execute(
-        text(
-            """
-            SELECT status_id
-            FROM task_statuses
-            WHERE upper(trim(code)) = upper(trim(:code))
-            """
-        ),
-        {"code": normalized},
-    ).mappings().first()
+    key = normalized.upper()
+    status_id = _STATUS_ID_BY_CODE.get(key)
+    if status_id is None:
+        _reload_status_ids(conn)
+        status_id = _STATUS_ID_BY_CODE.get(key)
 
-    if not row:
+    if status_id is None:
         raise HTTPException(status_code=400, detail=f"Unknown status code: {code}")
-    return int(row["status_id"])
+    return status_id
+
+
+# assignment_scope_t labels only change with a migration: load them once per
+# process and keep a lowercase index so normalization is a dict lookup.
+_SCOPE_LABELS: FrozenSet[str] = frozenset()
+_SCOPE_LABEL_BY_LOWER: Dict[str, str] = {}
+_DEFAULT_SCOPE_LABEL: Optional[str] = None
+
+# Callers only need membership, so no ORDER BY; one array row instead of N.
+_SCOPE_LABELS_SQL = text(
+    """
+    SELECT array_agg(e.enumlabel::text)
+    FROM pg_enum e
+    JOIN pg_type t ON t.oid = e.enumtypid
+    WHERE t.typname = 'assignment_scope_t'
+    """
+)
 
+_LEGACY_SCOPE_MAP: Mapping[str, str] = MappingProxyType(
+    {
+        "role": "functional",
+        "any": "functional",
+        "user": "admin",
+    }
+)
 
-def load_assignment_scope_enum_labels(conn) -> Set[str]:
-    rows = conn.execute(
-        text(
-            """
-            SELECT e.enumlabel
-            FROM pg_enum e
-            JOIN pg_type t ON t.oid = e.enumtypid
-            WHERE t.typname = 'assignment_scope_t'
-            ORDER BY e.enumsortorder
-            """
-        )
-    ).all()
-    return {r[0] for r in rows}
 
+def reset_assignment_scope_cache() -> None:
+    global _SCOPE_LABELS, _SCOPE_LABEL_BY_LOWER, _DEFAULT_SCOPE_LABEL
+    _SCOPE_LABELS = frozenset()
+    _SCOPE_LABEL_BY_LOWER = {}
+    _DEFAULT_SCOPE_LABEL = None
 
-def scope_label_or_none(allowed: Set[str], wanted_lower: str) -> Optional[str]:
-    for lbl in allowed:
-        if lbl.lower() == wanted_lower:
-            return lbl
-    return None
 
+def load_assignment_scope_enum_labels(conn) -> FrozenSet[str]:
+    global _SCOPE_LABELS, _SCOPE_LABEL_BY_LOWER, _DEFAULT_SCOPE_LABEL
+    if _SCOPE_LABELS:
+        return _SCOPE_LABELS
 
-def _pick_default_scope(allowed: Set[str]) -> str:
-    for lbl in allowed:
-        if lbl.lower() == "functional":
-            return lbl
-    return sorted(allowed)[0]
+    found = conn.execute(_SCOPE_LABELS_SQL).scalar()
+    labels = frozenset(found or ())
+    if labels:
+        by_lower = {lbl.lower(): lbl for lbl in labels}
+        # Legacy aliases resolve to their cased label up front; real labels win.
+        for alias, target in _LEGACY_SCOPE_MAP.items():
+            if alias not in by_lower and target in by_lower:
+                by_lower[alias] = by_lower[target]
+        _SCOPE_LABEL_BY_LOWER = by_lower
+        _DEFAULT_SCOPE_LABEL = _SCOPE_LABEL_BY_LOWER.get("functional") or sorted(labels)[0]
+        _SCOPE_LABELS = labels
+    return labels
 
 
 def normalize_assignment_scope(conn, value: Any) -> str:
+    # Fast path: an exact label once the cache is warm needs neither conn nor lookups.
+    if isinstance(value, str) and value in _SCOPE_LABELS:
+        return value
+
     allowed = load_assignment_scope_enum_labels(conn)
     if not allowed:
         raise HTTPException(status_code=500, detail="assignment_scope_t enum not found in DB")
 
     if value is None or (isinstance(value, str) and not value.strip()):
-        return _pick_default_scope(allowed)
+        return str(_DEFAULT_SCOPE_LABEL)
 
     raw = str(value).strip()
-
     if raw in allowed:
         return raw
 
-    raw_l = raw.lower()
-    for lbl in allowed:
-        if lbl.lower() == raw_l:
-            return lbl
-
-    legacy_map = {
-        "role": "functional",
-        "any": "functional",
-        "user": "admin",
-    }
-    if raw_l in legacy_map:
-        target_l = legacy_map[raw_l].lower()
-        mapped = scope_label_or_none(allowed, target_l)
-        if mapped:
-            return mapped
+    mapped = _SCOPE_LABEL_BY_LOWER.get(raw.lower())
+    if mapped:
+        return mapped
 
     raise HTTPException(
         status_code=422,
@@ -275,9 +312,7 @@ def _is_task_manager_role(
         is_system_admin_role_id(current_role_id)
         or (int(current_user_id) in privileged_user_ids)
         or (int(current_role_id) in privileged_role_ids)
-        or (int(current_role_id) in DIRECTOR_ROLE_IDS)
-        or (int(current_role_id) in DEPUTY_ROLE_IDS)
-        or (int(current_role_id) in SUPERVISOR_ROLE_IDS)
+        or (int(current_role_id) in MANAGEMENT_ROLE_IDS)
         or bool(other_visible_roles)
     )
 
@@ -467,9 +502,7 @@ def get_manual_task_role_options_for_user(
     role_meta = load_role_meta(conn, role_id=int(current_role_id))
     is_manager = (
         is_privileged
-        or (int(current_role_id) in DIRECTOR_ROLE_IDS)
-        or (int(current_role_id) in DEPUTY_ROLE_IDS)
-        or (int(current_role_id) in SUPERVISOR_ROLE_IDS)
+        or (int(current_role_id) in MANAGEMENT_ROLE_IDS)
         or _looks_like_manager_role(
             role_code=role_meta.get("code"),
             role_name=role_meta.get("name"),
@@ -580,88 +613,103 @@ def get_manual_task_role_options_for_user(
     }
 
 
+# Shared projection for a single task; {source} is public.tasks or a
+# data-modifying CTE (INSERT/UPDATE ... RETURNING *) aliased as t.
+_TASK_FULL_SELECT_SQL = """
+SELECT
+    t.task_id,
+    t.period_id,
+    t.regular_task_id,
+    t.title,
+    t.description,
+    t.initiator_user_id,
+    t.created_by_user_id,
+    t.approver_user_id,
+    t.executor_role_id,
+    er.code AS executor_role_code,
+    er.name AS executor_role_name,
+    er.name AS executor_role_name_ru,
+    ex.executor_user_id,
+    ex.executor_name,
+    t.assignment_scope,
+    t.status_id,
+    t.task_kind,
+    t.requires_report,
+    t.requires_approval,
+    t.source_kind,
+    t.source_note,
+    t.due_date,
+    rt.schedule_type AS schedule_type,
+    ts.code AS status_code,
+    ts.name_ru AS status_name_ru,
+
+    tr.report_link AS report_link,
+    tr.submitted_at AS report_submitted_at,
+    tr.submitted_by AS report_submitted_by,
+    rs.name AS report_submitted_by_role_name,
+    rs.code AS report_submitted_by_role_code,
+
+    tr.approved_at AS report_approved_at,
+    tr.approved_by AS report_approved_by,
+    ra.name AS report_approved_by_role_name,
+    ra.code AS report_approved_by_role_code,
+
+    tr.current_comment AS report_current_comment
+FROM {source} t
+LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
+LEFT JOIN public.roles er ON er.role_id = t.executor_role_id
+LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
+LEFT JOIN LATERAL (
+    SELECT
+        ue.user_id AS executor_user_id,
+        ue.full_name AS executor_name
+    FROM public.users ue
+    WHERE ue.role_id = t.executor_role_id
+      AND COALESCE(ue.is_active, TRUE) = TRUE
+    ORDER BY ue.user_id
+    LIMIT 1
+) ex ON TRUE
+LEFT JOIN LATERAL (
+    SELECT
+        r.report_link,
+        r.submitted_at,
+        r.submitted_by,
+        r.approved_at,
+        r.approved_by,
+        r.current_comment
+    FROM public.task_reports r
+    WHERE r.task_id = t.task_id
+    ORDER BY
+        r.submitted_at DESC NULLS LAST,
+        r.approved_at  DESC NULLS LAST,
+        r.report_id    DESC
+    LIMIT 1
+) tr ON TRUE
+LEFT JOIN public.users us ON us.user_id = tr.submitted_by
+LEFT JOIN public.roles rs ON rs.role_id = us.role_id
+LEFT JOIN public.users ua ON ua.user_id = tr.approved_by
+LEFT JOIN public.roles ra ON ra.role_id = ua.role_id
+"""
+
+_LOAD_TASK_FULL_SQL = text(
+    _TASK_FULL_SELECT_SQL.format(source="public.tasks") + "WHERE t.task_id = :task_id"
+)
+
+
 def load_task_full(conn, *, task_id: int) -> Optional[Dict[str, Any]]:
-    row = conn.execute(
-        text(
-            """
-            SELECT
-                t.task_id,
-                t.period_id,
-                t.regular_task_id,
-                t.title,
-                t.description,
-                t.initiator_user_id,
-                t.created_by_user_id,
-                t.approver_user_id,
-                t.executor_role_id,
-                er.code AS executor_role_code,
-                er.name AS executor_role_name,
-                er.name AS executor_role_name_ru,
-                ex.executor_user_id,
-                ex.executor_name,
-                t.assignment_scope,
-                t.status_id,
-                t.task_kind,
-                t.requires_report,
-                t.requires_approval,
-                t.source_kind,
-                t.source_note,
-                t.due_date,
-                rt.schedule_type AS schedule_type,
-                ts.code AS status_code,
-                ts.name_ru AS status_name_ru,
-
-                tr.report_link AS report_link,
-                tr.submitted_at AS report_submitted_at,
-                tr.submitted_by AS report_submitted_by,
-                rs.name AS report_submitted_by_role_name,
-                rs.code AS report_submitted_by_role_code,
-
-                tr.approved_at AS report_approved_at,
-                tr.approved_by AS report_approved_by,
-                ra.name AS report_approved_by_role_name,
-                ra.code AS report_approved_by_role_code,
-
-                tr.current_comment AS report_current_comment
-            FROM public.tasks t
-            LEFT JOIN public.task_statuses ts ON ts.status_id = t.status_id
-            LEFT JOIN public.roles er ON er.role_id = t.executor_role_id
-            LEFT JOIN public.regular_tasks rt ON rt.regular_task_id = t.regular_task_id
-            LEFT JOIN LATERAL (
-                SELECT
-                    ue.user_id AS executor_user_id,
-                    ue.full_name AS executor_name
-                FROM public.users ue
-                WHERE ue.role_id = t.executor_role_id
-                  AND COALESCE(ue.is_active, TRUE) = TRUE
-                ORDER BY ue.user_id
-                LIMIT 1
-            ) ex ON TRUE
-            LEFT JOIN LATERAL (
-                SELECT
-                    r.report_link,
-                    r.submitted_at,
-                    r.submitted_by,
-                    r.approved_at,
-                    r.approved_by,
-                    r.current_comment
-                FROM public.task_reports r
-                WHERE r.task_id = t.task_id
-                ORDER BY
-                    r.submitted_at DESC NULLS LAST,
-                    r.approved_at  DESC NULLS LAST,
-                    r.report_id    DESC
-                LIMIT 1
-            ) tr ON TRUE
-            LEFT JOIN public.users us ON us.user_id = tr.submitted_by
-            LEFT JOIN public.roles rs ON rs.role_id = us.role_id
-            LEFT JOIN public.users ua ON ua.user_id = tr.approved_by
-            LEFT JOIN public.roles ra ON ra.role_id = ua.role_id
-            WHERE t.task_id = :task_id
-            """
-        ),
-        {"task_id": int(task_id)},
-    ).mappings().first()
+    row = conn.execute(_LOAD_TASK_FULL_SQL, {"task_id": int(task_id)}).mappings().first()
+    return dict(row) if row else None
+
+
+@lru_cache(maxsize=64)
+def _returning_full_sql(write_sql: str):
+    # Call sites pass a fixed set of statements (PATCH varies only by column set).
+    return text(f"WITH w AS (\n{write_sql}\n)\n" + _TASK_FULL_SELECT_SQL.format(source="w"))
+
+
+def write_task_returning_full(conn, *, write_sql: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Run INSERT/UPDATE ... RETURNING * on tasks and load the full row in the same statement."""
+    row = conn.execute(_returning_full_sql(write_sql), params).mappings().first()
     return dict(row) if row else None
 
 def _is_initiator(*, current_user_id: int, task_row: Dict[str, Any]) -> bool:
@@ -695,20 +743,30 @@ def _is_report_author(*, current_user_id: int, task_row: Dict[str, Any]) -> bool
         return False
 
 
+_USER_REPORT_ON_TASK_SQL = text(
+    """
+    SELECT 1
+    FROM public.task_reports r
+    WHERE r.task_id = :task_id
+      AND r.submitted_by = :user_id
+    LIMIT 1
+    """
+)
+
+_REGULAR_TASK_TARGET_ROLE_SQL = text(
+    """
+    SELECT COALESCE(rt.target_role_id, 0) AS target_role_id
+    FROM public.regular_tasks rt
+    WHERE rt.regular_task_id = :regular_task_id
+    """
+)
+
+
 def _user_has_any_report_on_task(conn, *, task_id: int, user_id: int) -> bool:
-    row = conn.execute(
-        text(
-            """
-            SELECT 1
-            FROM public.task_reports r
-            WHERE r.task_id = :task_id
-              AND r.submitted_by = :user_id
-            LIMIT 1
-            """
-        ),
+    return conn.execute(
+        _USER_REPORT_ON_TASK_SQL,
         {"task_id": int(task_id), "user_id": int(user_id)},
-    ).mappings().first()
-    return bool(row)
+    ).scalar() is not None
 
 
 def _is_legacy_approver_role(
@@ -729,22 +787,16 @@ def _is_legacy_approver_role(
     if regular_task_id <= 0:
         return False
 
-    row = conn.execute(
-        text(
-            """
-            SELECT COALESCE(rt.target_role_id, 0) AS target_role_id
-            FROM public.regular_tasks rt
-            WHERE rt.regular_task_id = :regular_task_id
-            """
-        ),
+    target_role_id = conn.execute(
+        _REGULAR_TASK_TARGET_ROLE_SQL,
         {"regular_task_id": int(regular_task_id)},
-    ).mappings().first()
+    ).scalar()
 
-    if not row:
+    if target_role_id is None:
         return False
 
     try:
-        return int(row["target_role_id"]) == int(current_role_id)
+        return int(target_role_id) == int(current_role_id)
     except Exception:
         return False
 
@@ -821,6 +873,13 @@ def _is_task_visible_to_user(
     if _is_executor_role(current_role_id=current_role_id, task_row=task_row):
         return True
 
+    # Row-only checks first; everything below goes to the DB.
+    if _is_report_author(current_user_id=current_user_id, task_row=task_row):
+        return True
+
+    if _is_explicit_approver_user(current_user_id=current_user_id, task_row=task_row):
+        return True
+
     visible_executor_role_ids = compute_visible_executor_role_ids_for_tasks(
         user_id=int(current_user_id)
     )
@@ -831,9 +890,6 @@ def _is_task_visible_to_user(
     if erid in visible_executor_role_ids:
         return True
 
-    if _is_report_author(current_user_id=current_user_id, task_row=task_row):
-        return True
-
     try:
         task_id = int(task_row.get("task_id") or 0)
     except Exception:
@@ -845,9 +901,6 @@ def _is_task_visible_to_user(
     ):
         return True
 
-    if _is_explicit_approver_user(current_user_id=current_user_id, task_row=task_row):
-        return True
-
     if _is_legacy_approver_role(
         conn,
         current_role_id=int(current_role_id),
@@ -863,6 +916,19 @@ def _is_task_visible_to_user(
     )
 
 
+_UNIT_HAS_EXECUTOR_ROLE_SQL = text(
+    """
+    SELECT 1
+    FROM public.users ux
+    WHERE ux.role_id = :executor_role_id
+      AND ux.unit_id = :unit_id
+      AND ux.user_id <> :current_user_id
+      AND COALESCE(ux.is_active, TRUE) = TRUE
+    LIMIT 1
+    """
+)
+
+
 def _task_matches_team_scope(
     conn,
     *,
@@ -910,17 +976,7 @@ def _task_matches_team_scope(
         return False
 
     row = conn.execute(
-        text(
-            """
-            SELECT 1
-            FROM public.users ux
-            WHERE ux.role_id = :executor_role_id
-              AND ux.unit_id = :unit_id
-              AND ux.user_id <> :current_user_id
-              AND COALESCE(ux.is_active, TRUE) = TRUE
-            LIMIT 1
-            """
-        ),
+        _UNIT_HAS_EXECUTOR_ROLE_SQL,
         {
             "executor_role_id": int(executor_role_id),
             "unit_id": int(current_unit_id),
@@ -1032,6 +1088,21 @@ def can_approve(*, current_user_id: int, current_role_id: int, task_row: Dict[st
     return False
 
 
+_CLOSED_STATUS_CODES: FrozenSet[str] = frozenset({"ARCHIVED", "DONE"})
+
+# status_code -> (task flag the action needs, ACL check for non-admins, actions)
+_STATUS_ACTIONS: Mapping[
+    str, Tuple[Callable[[Dict[str, Any]], bool], Callable[..., bool], Tuple[str, ...]]
+] = MappingProxyType(
+    {
+        "IN_PROGRESS": (_task_requires_report, can_report_or_update, ("report",)),
+        "WAITING_REPORT": (_task_requires_report, can_report_or_update, ("report",)),
+        "REJECTED": (_task_requires_report, can_report_or_update, ("report",)),
+        "WAITING_APPROVAL": (_task_requires_approval, can_approve, ("approve", "reject")),
+    }
+)
+
+
 def _allowed_actions_for_user(
     *,
     task_row: Dict[str, Any],
@@ -1039,67 +1110,37 @@ def _allowed_actions_for_user(
     current_role_id: int,
 ) -> List[str]:
     code = str(task_row.get("status_code") or "")
+    entry = _STATUS_ACTIONS.get(code)
 
     if is_system_admin_role_id(current_role_id):
         actions: List[str] = ["delete"]
-
-        if code not in ("ARCHIVED", "DONE"):
+        if code not in _CLOSED_STATUS_CODES:
             actions.append("archive")
+        if entry is not None and entry[0](task_row):
+            actions.extend(entry[2])
+        return actions
 
-        if code in ("IN_PROGRESS", "WAITING_REPORT", "REJECTED") and _task_requires_report(task_row):
-            actions.append("report")
-
-        if code == "WAITING_APPROVAL" and _task_requires_approval(task_row):
-            actions.append("approve")
-            actions.append("reject")
-
-        seen_admin: Set[str] = set()
-        out_admin: List[str] = []
-        for a in actions:
-            if a in seen_admin:
-                continue
-            seen_admin.add(a)
-            out_admin.append(a)
-        return out_admin
-
-    actions: List[str] = []
-
-    if _task_requires_report(task_row) and code in ("IN_PROGRESS", "WAITING_REPORT", "REJECTED"):
-        if can_report_or_update(
-            current_user_id=current_user_id,
-            current_role_id=current_role_id,
-            task_row=task_row,
-        ):
-            actions.append("report")
-
-    if _task_requires_approval(task_row) and code == "WAITING_APPROVAL":
-        if can_approve(
+    actions = []
+    if (
+        entry is not None
+        and entry[0](task_row)
+        and entry[1](
             current_user_id=current_user_id,
             current_role_id=current_role_id,
             task_row=task_row,
-        ):
-            actions.append("approve")
-            actions.append("reject")
-
-    if (
-        _is_initiator(current_user_id=current_user_id, task_row=task_row)
-        and code not in ("ARCHIVED", "DONE")
+        )
     ):
+        actions.extend(entry[2])
+
+    if code not in _CLOSED_STATUS_CODES and _is_initiator(current_user_id=current_user_id, task_row=task_row):
         actions.append("archive")
 
-    seen: Set[str] = set()
-    out: List[str] = []
-    for a in actions:
-        if a in seen:
-            continue
-        seen.add(a)
-        out.append(a)
-    return out
+    return actions
 
 
 def attach_allowed_actions(
     *,
-    task: Dict[str, Any],
+    task: Mapping[str, Any],
     current_user_id: int,
     current_role_id: int,
 ) -> Dict[str, Any]:
@@ -1112,6 +1153,42 @@ def attach_allowed_actions(
     return t
 
 
+# Values are cast to jsonb, which re-parses and normalizes them: send compact
+# UTF-8 text instead of ASCII-escaped, space-padded JSON.
+def _audit_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+_WRITE_TASK_AUDIT_SQL = text(
+    """
+    INSERT INTO task_audit_log (
+        task_id,
+        actor_user_id,
+        action,
+        fields_changed,
+        request_body,
+        meta,
+        event_type,
+        actor_id,
+        actor_role,
+        payload
+    )
+    VALUES (
+        :task_id,
+        :actor_user_id,
+        :action,
+        CAST(:fields_changed AS jsonb),
+        CAST(:request_body AS jsonb),
+        CAST(:meta AS jsonb),
+        CASE WHEN :event_type IS NULL THEN NULL ELSE (:event_type)::task_event_type END,
+        :actor_id,
+        :actor_role,
+        CAST(:payload AS jsonb)
+    )
+    """
+)
+
+
 def write_task_audit(
     conn,
     *,
@@ -1126,44 +1203,17 @@ def write_task_audit(
     event_payload: Optional[Dict[str, Any]] = None,
 ) -> None:
     conn.execute(
-        text(
-            """
-            INSERT INTO task_audit_log (
-                task_id,
-                actor_user_id,
-                action,
-                fields_changed,
-                request_body,
-                meta,
-                event_type,
-                actor_id,
-                actor_role,
-                payload
-            )
-            VALUES (
-                :task_id,
-                :actor_user_id,
-                :action,
-                CAST(:fields_changed AS jsonb),
-                CAST(:request_body AS jsonb),
-                CAST(:meta AS jsonb),
-                CASE WHEN :event_type IS NULL THEN NULL ELSE (:event_type)::task_event_type END,
-                :actor_id,
-                :actor_role,
-                CAST(:payload AS jsonb)
-            )
-            """
-        ),
+        _WRITE_TASK_AUDIT_SQL,
         {
             "task_id": int(task_id),
             "actor_user_id": int(actor_user_id),
             "action": action,
-            "fields_changed": json.dumps(fields_changed) if fields_changed is not None else None,
-            "request_body": json.dumps(request_body) if request_body is not None else None,
-            "meta": json.dumps(meta) if meta is not None else None,
+            "fields_changed": _audit_json(fields_changed) if fields_changed is not None else None,
+            "request_body": _audit_json(request_body) if request_body is not None else None,
+            "meta": _audit_json(meta) if meta is not None else None,
             "event_type": event_type,
             "actor_id": int(actor_user_id),
-            "actor_role": str(actor_role_id) if actor_role_id is not None else None,
-            "payload": json.dumps(event_payload or {}) if event_type is not None else json.dumps({}),
+            "actor_role": int(actor_role_id) if actor_role_id is not None else None,
+            "payload": _audit_json(event_payload or {}) if event_type is not None else "{}",
         },
-    )
\ No newline at end of file
+    )
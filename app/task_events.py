@@ -9,7 +9,8 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, Header, HTTPException, Query
 from sqlalchemy import text
 
-from app.db.engine import engine
+from app.core.json_response import RowsJSONResponse
+from app.db.engine import connect_autocommit, engine
 from app.security.directory_scope import require_uid
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
@@ -81,6 +82,27 @@ def _norm_channel(v: Any) -> str:
 # Public: per-user events feed (recipients)
 # ---------------------------
 
+# Keyset only (no OFFSET): ix_task_event_recipients_user_audit serves the
+# user_id / audit_id range and order, so a page costs O(limit).
+_MY_EVENTS_SQL = text(
+    """
+    SELECT
+      e.audit_id,
+      e.task_id,
+      e.event_type,
+      e.actor_user_id,
+      e.actor_role_id,
+      e.payload
+    FROM public.task_event_recipients r
+    JOIN public.task_events e ON e.audit_id = r.audit_id
+    WHERE r.user_id = :uid
+      AND r.audit_id > :cursor
+    ORDER BY r.audit_id ASC
+    LIMIT :limit
+    """
+)
+
+
 @router.get("/me/events")
 def list_my_task_events(
     *,
@@ -93,56 +115,35 @@ def list_my_task_events(
         description="Последний доставленный audit_id (cursor). Вернём события > since_audit_id.",
     ),
     limit: int = Query(default=50, ge=1, le=200),
-) -> Dict[str, Any]:
+) -> RowsJSONResponse:
     uid = _require_request_user_id(
         authorization=authorization,
         x_user_id=x_user_id,
         x_internal_api_token=x_internal_api_token,
     )
 
-    q = text(
-        """
-        SELECT
-          e.audit_id,
-          e.task_id,
-          e.event_type,
-          e.actor_user_id,
-          e.actor_role_id,
-          e.payload
-        FROM public.task_event_recipients r
-        JOIN public.task_events e ON e.audit_id = r.audit_id
-        WHERE r.user_id = :uid
-          AND e.audit_id > :cursor
-        ORDER BY e.audit_id ASC
-        LIMIT :limit
-        """
-    )
-
-    with engine.begin() as conn:
+    with connect_autocommit() as conn:
         rows = conn.execute(
-            q,
+            _MY_EVENTS_SQL,
             {"uid": int(uid), "cursor": int(since_audit_id), "limit": int(limit)},
-        ).mappings().all()
-
-    items: List[Dict[str, Any]] = []
-    next_cursor = int(since_audit_id)
-
-    for r in rows:
-        audit_id = int(r["audit_id"])
-        next_cursor = max(next_cursor, audit_id)
-
-        items.append(
-            {
-                "audit_id": audit_id,
-                "task_id": int(r["task_id"]),
-                "event_type": str(r["event_type"] or ""),
-                "actor_user_id": int(r["actor_user_id"]) if r.get("actor_user_id") is not None else None,
-                "actor_role_id": int(r["actor_role_id"]) if r.get("actor_role_id") is not None else None,
-                "payload": _as_dict_payload(r.get("payload")),
-            }
-        )
+        ).all()
+
+    # Positional rows in _MY_EVENTS_SQL column order; bigint columns are already ints.
+    items: List[Dict[str, Any]] = [
+        {
+            "audit_id": audit_id,
+            "task_id": task_id,
+            "event_type": event_type or "",
+            "actor_user_id": actor_user_id,
+            "actor_role_id": actor_role_id,
+            "payload": _as_dict_payload(payload),
+        }
+        for audit_id, task_id, event_type, actor_user_id, actor_role_id, payload in rows
+    ]
+    # Rows come in audit_id order, so the last one is the new cursor.
+    next_cursor = items[-1]["audit_id"] if items else int(since_audit_id)
 
-    return {"items": items, "next_cursor": next_cursor}
+    return RowsJSONResponse({"items": items, "next_cursor": next_cursor})
 
 
 # ---------------------------
@@ -353,7 +354,7 @@ def analytics_task_events_summary(
         "only_with_deliveries": bool(only_with_deliveries),
     }
 
-    with engine.begin() as conn:
+    with connect_autocommit() as conn:
         row = conn.execute(q, params).mappings().first()
 
     if not row:
@@ -432,7 +433,7 @@ def list_pending_deliveries(
         """
     )
 
-    with engine.begin() as conn:
+    with connect_autocommit() as conn:
         rows = conn.execute(
             q,
             {
@@ -2,18 +2,22 @@
 from __future__ import annotations
 
 import hashlib
+import heapq
+import hmac
 import os
 import secrets
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Optional, Any
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Header, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
-from app.db.engine import engine
+from app.db.engine import connect_autocommit, engine
 from app.errors import raise_error, ErrorCode
 from app.security.directory_scope import require_uid
 
@@ -41,9 +45,8 @@ def _gen_code() -> str:
     Human-readable code: 8 chars + dash + 4 chars.
     Sufficient for MVP.
     """
-    a = secrets.token_hex(4)  # 8 hex chars
-    b = secrets.token_hex(2)  # 4 hex chars
-    return f"{a}-{b}".upper()
+    h = secrets.token_bytes(6).hex().upper()  # 12 hex chars, one urandom read
+    return f"{h[:8]}-{h[8:]}"
 
 
 @dataclass
@@ -55,7 +58,14 @@ class _BindCodeRecord:
 
 
 # in-memory store: code_hash -> record
+# Per-process by design: the backend runs one uvicorn worker (deploy/systemd). Running
+# several workers would need these codes in shared storage (e.g. a DB table).
 _CODES: Dict[str, _BindCodeRecord] = {}
+# user_id -> code_hash of the user's current unused code
+_ACTIVE_CODE_BY_USER: Dict[int, str] = {}
+# (expires_at, code_hash) min-heap; entries for codes already gone are skipped
+_EXPIRY_HEAP: List[Tuple[datetime, str]] = []
+_CODES_LOCK = threading.Lock()
 
 
 def _conflict_detail(
@@ -88,7 +98,9 @@ def _require_bot_token(x_bot_token: str | None) -> None:
         raise HTTPException(status_code=500, detail="BOT_BIND_TOKEN is not configured on backend")
 
     # forbidden (403) by error contract
-    if not x_bot_token or x_bot_token.strip() != BOT_BIND_TOKEN:
+    if not x_bot_token or not hmac.compare_digest(
+        x_bot_token.strip().encode("utf-8"), BOT_BIND_TOKEN.encode("utf-8")
+    ):
         raise_error(ErrorCode.TGBIND_FORBIDDEN_CONSUME)
 
 
@@ -109,17 +121,41 @@ def _require_request_user_id(
 
 
 
+def _drop_code(code_hash: str) -> Optional[_BindCodeRecord]:
+    rec = _CODES.pop(code_hash, None)
+    if rec is not None and _ACTIVE_CODE_BY_USER.get(rec.user_id) == code_hash:
+        _ACTIVE_CODE_BY_USER.pop(rec.user_id, None)
+    return rec
+
+
 def _invalidate_active_codes_for_user(user_id: int) -> None:
-    for code_hash, rec in list(_CODES.items()):
-        if rec.user_id == int(user_id) and rec.used_at is None:
+    with _CODES_LOCK:
+        code_hash = _ACTIVE_CODE_BY_USER.pop(int(user_id), None)
+        if code_hash is not None:
             _CODES.pop(code_hash, None)
 
 
 def _gc_expired_codes() -> None:
     now = _now_utc()
-    dead = [h for h, rec in _CODES.items() if rec.expires_at <= now or rec.used_at is not None]
-    for h in dead:
-        _CODES.pop(h, None)
+    with _CODES_LOCK:
+        while _EXPIRY_HEAP and _EXPIRY_HEAP[0][0] <= now:
+            _, code_hash = heapq.heappop(_EXPIRY_HEAP)
+            _drop_code(code_hash)
+
+
+def _release_code(code_hash: str, rec: _BindCodeRecord) -> None:
+    # Failed bind: the code stays usable unless the user has issued a newer one meanwhile.
+    with _CODES_LOCK:
+        if rec.user_id not in _ACTIVE_CODE_BY_USER:
+            _CODES[code_hash] = rec
+            _ACTIVE_CODE_BY_USER[rec.user_id] = code_hash
+
+
+def _store_code(code_hash: str, rec: _BindCodeRecord) -> None:
+    with _CODES_LOCK:
+        _CODES[code_hash] = rec
+        _ACTIVE_CODE_BY_USER[rec.user_id] = code_hash
+        heapq.heappush(_EXPIRY_HEAP, (rec.expires_at, code_hash))
 
 
 # ---- DB helpers ----
@@ -175,6 +211,7 @@ def unbind_user_telegram(*, user_id: int, actor_user_id: Optional[int] = None) -
 
     applied = bool(had_binding)
     if applied:
+        _invalidate_tg_user_cache()
         try:
             from app.services.security_audit_service import write_security_event
 
@@ -201,19 +238,46 @@ def unbind_user_telegram(*, user_id: int, actor_user_id: Optional[int] = None) -
     }
 
 
+# Optional short-lived cache of telegram_id -> user_id for bot traffic (self-bind and
+# internal bot auth resolve it on every message). Off by default (TTL 0). Only bound
+# ids are cached; bind/unbind through this module drops the whole cache, and changes
+# made by other processes become visible within the TTL.
+_TG_USER_CACHE_TTL_S = max(0.0, float(os.getenv("TG_USER_CACHE_TTL_S", "0") or 0))
+_TG_USER_CACHE_MAX_ENTRIES = 4096
+_TG_USER_CACHE: Dict[int, Tuple[float, int]] = {}
+
+
+def _invalidate_tg_user_cache() -> None:
+    _TG_USER_CACHE.clear()
+
+
+_USER_ID_BY_TELEGRAM_SQL = text("SELECT user_id FROM users WHERE telegram_id = :tg LIMIT 1")
+
+
 def _get_user_id_by_telegram_id(tg_user_id: int) -> Optional[int]:
-    sql = "SELECT user_id FROM users WHERE telegram_id = :tg LIMIT 1"
-    tg_text = str(int(tg_user_id))  # ALWAYS TEXT
-    with engine.begin() as conn:
-        row = conn.execute(text(sql), {"tg": tg_text}).fetchone()
+    tg = int(tg_user_id)
+    if _TG_USER_CACHE_TTL_S > 0:
+        hit = _TG_USER_CACHE.get(tg)
+        if hit is not None and hit[0] >= time.monotonic():
+            return hit[1]
+
+    tg_text = str(tg)  # ALWAYS TEXT
+    with connect_autocommit() as conn:
+        row = conn.execute(_USER_ID_BY_TELEGRAM_SQL, {"tg": tg_text}).fetchone()
     if not row:
         return None
-    return int(row[0])
+    user_id = int(row[0])
+
+    if _TG_USER_CACHE_TTL_S > 0:
+        if len(_TG_USER_CACHE) >= _TG_USER_CACHE_MAX_ENTRIES:
+            _TG_USER_CACHE.clear()
+        _TG_USER_CACHE[tg] = (time.monotonic() + _TG_USER_CACHE_TTL_S, user_id)
+    return user_id
 
 
 def _get_telegram_id_by_user_id(user_id: int) -> Optional[int]:
     sql = "SELECT telegram_id FROM users WHERE user_id = :uid"
-    with engine.begin() as conn:
+    with connect_autocommit() as conn:
         row = conn.execute(text(sql), {"uid": int(user_id)}).fetchone()
     if not row:
         return None
@@ -227,6 +291,49 @@ def _get_telegram_id_by_user_id(user_id: int) -> Optional[int]:
         return None
 
 
+def _tg_already_bound_error(tg_user_id: int) -> HTTPException:
+    # Keep the same contract shape; no dependency on missing ErrorCode enum
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=_conflict_detail(
+            code="TGBIND_CONFLICT_TG_ALREADY_BOUND",
+            message="Невозможно выполнить привязку",
+            reason="Этот Telegram уже привязан к другому пользователю",
+            hint="Обратитесь к администратору для смены привязки",
+            extra={"tg_user_id": int(tg_user_id)},
+        ),
+    )
+
+
+_BIND_USER_TO_TELEGRAM_SQL = text(
+    """
+    WITH cur AS (
+        SELECT telegram_id FROM users WHERE user_id = :uid
+    ),
+    other AS (
+        SELECT user_id FROM users WHERE telegram_id = :tg AND user_id <> :uid LIMIT 1
+    ),
+    upd AS (
+        UPDATE users
+        SET telegram_id = :tg
+        WHERE user_id = :uid
+          -- same rule as the Python check below: blank counts as unbound
+          AND (
+                NULLIF(btrim(telegram_id::text), '') IS NULL
+                OR btrim(telegram_id::text) = :tg
+          )
+          AND NOT EXISTS (SELECT 1 FROM other)
+        RETURNING user_id
+    )
+    SELECT
+        (SELECT user_id FROM other) AS other_user_id,
+        EXISTS (SELECT 1 FROM cur) AS user_exists,
+        (SELECT telegram_id FROM cur) AS existing_tg,
+        EXISTS (SELECT 1 FROM upd) AS updated
+    """
+)
+
+
 def _bind_user_to_telegram(*, user_id: int, tg_user_id: int) -> None:
     """
     Sets users.telegram_id = tg_user_id (TEXT) for user_id.
@@ -241,66 +348,53 @@ def _bind_user_to_telegram(*, user_id: int, tg_user_id: int) -> None:
     uid = int(user_id)
     tg_text = str(int(tg_user_id))  # ALWAYS TEXT
 
-    with engine.begin() as conn:
-        # 1) Is this tg already used by another user?
-        row = conn.execute(
-            text("SELECT user_id FROM users WHERE telegram_id = :tg LIMIT 1"),
-            {"tg": tg_text},
-        ).fetchone()
-        if row and int(row[0]) != uid:
-            # Keep the same contract shape; no dependency on missing ErrorCode enum
+    try:
+        with engine.begin() as conn:
+            # One round trip: the UPDATE only applies when neither conflict holds, and the
+            # statement reports what it saw so the checks below keep their old order.
+            row = conn.execute(_BIND_USER_TO_TELEGRAM_SQL, {"tg": tg_text, "uid": uid}).mappings().first()
+    except IntegrityError:
+        # In case unique constraint triggers unexpectedly (concurrent bind of the same tg)
+        raise _tg_already_bound_error(tg_user_id)
+
+    # 1) Is this tg already used by another user?
+    if row["other_user_id"] is not None:
+        raise _tg_already_bound_error(tg_user_id)
+
+    # 2) Does user already have another telegram_id?
+    if not row["user_exists"]:
+        raise HTTPException(status_code=404, detail="user not found")
+
+    existing_tg = row["existing_tg"]
+    if existing_tg is not None:
+        existing_text = str(existing_tg).strip()
+        if existing_text and existing_text != tg_text:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=_conflict_detail(
-                    code="TGBIND_CONFLICT_TG_ALREADY_BOUND",
+                    code="TGBIND_CONFLICT_USER_ALREADY_BOUND",
                     message="Невозможно выполнить привязку",
-                    reason="Этот Telegram уже привязан к другому пользователю",
+                    reason="Пользователь уже привязан к другому Telegram",
                     hint="Обратитесь к администратору для смены привязки",
-                    extra={"tg_user_id": int(tg_user_id)},
+                    extra={"user_id": uid, "telegram_id": existing_text},
                 ),
             )
 
-        # 2) Does user already have another telegram_id?
-        row2 = conn.execute(
-            text("SELECT telegram_id FROM users WHERE user_id = :uid"),
-            {"uid": uid},
-        ).fetchone()
-        if not row2:
-            raise HTTPException(status_code=404, detail="user not found")
+    # No conflict was visible, yet nothing was written (the row changed under us):
+    # never report a bind that did not happen.
+    if not row["updated"]:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=_conflict_detail(
+                code="TGBIND_CONFLICT_USER_ALREADY_BOUND",
+                message="Невозможно выполнить привязку",
+                reason="Привязка пользователя изменилась во время операции",
+                hint="Повторите попытку",
+                extra={"user_id": uid},
+            ),
+        )
 
-        existing_tg = row2[0]
-        if existing_tg is not None:
-            existing_text = str(existing_tg).strip()
-            if existing_text and existing_text != tg_text:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=_conflict_detail(
-                        code="TGBIND_CONFLICT_USER_ALREADY_BOUND",
-                        message="Невозможно выполнить привязку",
-                        reason="Пользователь уже привязан к другому Telegram",
-                        hint="Обратитесь к администратору для смены привязки",
-                        extra={"user_id": uid, "telegram_id": existing_text},
-                    ),
-                )
-
-        # 3) Set (if NULL/empty or already same)
-        try:
-            conn.execute(
-                text("UPDATE users SET telegram_id = :tg WHERE user_id = :uid"),
-                {"tg": tg_text, "uid": uid},
-            )
-        except IntegrityError:
-            # In case unique constraint triggers unexpectedly
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=_conflict_detail(
-                    code="TGBIND_CONFLICT_TG_ALREADY_BOUND",
-                    message="Невозможно выполнить привязку",
-                    reason="Этот Telegram уже привязан к другому пользователю",
-                    hint="Обратитесь к администратору для смены привязки",
-                    extra={"tg_user_id": int(tg_user_id)},
-                ),
-            )
+    _invalidate_tg_user_cache()
 
 
 # ---- schemas ----
@@ -348,7 +442,7 @@ def create_bind_code(
     code_hash = _hash_code(code)
 
     expires_at = _now_utc() + timedelta(minutes=DEFAULT_TTL_MINUTES)
-    _CODES[code_hash] = _BindCodeRecord(user_id=user_id, expires_at=expires_at)
+    _store_code(code_hash, _BindCodeRecord(user_id=user_id, expires_at=expires_at))
 
     return TgBindCodeOut(code=code, expires_at=expires_at)
 
@@ -370,25 +464,23 @@ def consume_bind_code(
     _gc_expired_codes()
 
     code_hash = _hash_code(payload.code.strip().upper())
-    rec = _CODES.get(code_hash)
-
     now = _now_utc()
 
-    # Do not disclose details: same 409 for missing/expired/used.
-    if rec is None:
-        raise_error(ErrorCode.TGBIND_CONFLICT_CODE_INVALID)
-
-    if rec.used_at is not None:
-        raise_error(ErrorCode.TGBIND_CONFLICT_CODE_INVALID)
+    # Claim the code (get-and-delete) so two concurrent consumes cannot both bind.
+    with _CODES_LOCK:
+        rec = _drop_code(code_hash)
 
-    if rec.expires_at <= now:
-        _CODES.pop(code_hash, None)
+    # Do not disclose details: same 409 for missing/expired/used.
+    if rec is None or rec.used_at is not None or rec.expires_at <= now:
         raise_error(ErrorCode.TGBIND_CONFLICT_CODE_INVALID)
 
     # Persist binding in DB (atomic in helper transaction)
-    _bind_user_to_telegram(user_id=int(rec.user_id), tg_user_id=int(payload.tg_user_id))
+    try:
+        _bind_user_to_telegram(user_id=int(rec.user_id), tg_user_id=int(payload.tg_user_id))
+    except Exception:
+        _release_code(code_hash, rec)
+        raise
 
-    # Mark code as used after successful DB write
     rec.used_at = now
     rec.used_by_tg_user_id = int(payload.tg_user_id)
 
@@ -9,7 +9,8 @@ from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query
 from pydantic import BaseModel
 from sqlalchemy import text
 
-from app.db.engine import engine
+from app.core.json_response import RowsJSONResponse
+from app.db.engine import connect_autocommit
 from app.security.bot_internal_auth import (
     is_service_account_user,
     require_bot_bound_user,
@@ -18,6 +19,7 @@ from app.security.bot_internal_auth import (
     resolve_bound_user_id_from_telegram,
 )
 from app.services.tasks_router import (
+    _user_role_id,
     approve_report,
     get_task,
     list_tasks,
@@ -27,7 +29,6 @@ from app.services.tasks_router import (
 )
 from app.services.tasks_service import (
     ensure_task_visible_or_404,
-    get_user_role_id,
     load_task_full,
 )
 from app.task_events import list_my_task_events
@@ -117,8 +118,9 @@ def bot_list_tasks(
     task_kind: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[int] = Query(None, ge=1),
     user: Dict[str, Any] = Depends(require_bot_bound_user),
-) -> Dict[str, Any]:
+) -> RowsJSONResponse:
     return list_tasks(
         period_id=period_id,
         status_code=status_code,
@@ -133,6 +135,7 @@ def bot_list_tasks(
         task_kind=task_kind,
         limit=limit,
         offset=offset,
+        cursor=cursor,
         user=user,
     )
 
@@ -182,16 +185,34 @@ def bot_reject_report(
     return reject_report(payload=payload, task_id=task_id, user=user)
 
 
+_TASK_EVENTS_SQL = text(
+    """
+    SELECT
+      e.audit_id,
+      e.task_id,
+      e.event_type,
+      e.actor_user_id,
+      e.actor_role_id,
+      e.payload,
+      e.created_at
+    FROM public.task_events e
+    WHERE e.task_id = :task_id
+    ORDER BY e.audit_id ASC
+    LIMIT :limit
+    """
+)
+
+
 @router.get("/tasks/{task_id}/events")
 def bot_task_events(
     task_id: int = Path(..., ge=1),
     include_archived: bool = Query(False),
     limit: int = Query(200, ge=1, le=500),
     user: Dict[str, Any] = Depends(require_bot_bound_user),
-) -> List[Dict[str, Any]]:
+) -> RowsJSONResponse:
     current_user_id = int(user["user_id"])
-    with engine.begin() as conn:
-        role_id = get_user_role_id(conn, current_user_id)
+    with connect_autocommit() as conn:
+        role_id = _user_role_id(conn, user)
         task = load_task_full(conn, task_id=int(task_id))
         ensure_task_visible_or_404(
             conn=conn,
@@ -201,40 +222,26 @@ def bot_task_events(
             include_archived=include_archived,
         )
 
-        rows = conn.execute(
-            text(
-                """
-                SELECT
-                  e.audit_id,
-                  e.task_id,
-                  e.event_type,
-                  e.actor_user_id,
-                  e.actor_role_id,
-                  e.payload,
-                  e.created_at
-                FROM public.task_events e
-                WHERE e.task_id = :task_id
-                ORDER BY e.audit_id ASC
-                LIMIT :limit
-                """
-            ),
+        result = conn.execute(
+            _TASK_EVENTS_SQL,
             {"task_id": int(task_id), "limit": int(limit)},
-        ).mappings().all()
+        )
 
-    items: List[Dict[str, Any]] = []
-    for r in rows:
-        items.append(
+        # Positional rows in _TASK_EVENTS_SQL column order; created_at stays a
+        # datetime and RowsJSONResponse writes it as isoformat.
+        items: List[Dict[str, Any]] = [
             {
-                "audit_id": int(r["audit_id"]),
-                "task_id": int(r["task_id"]),
-                "event_type": str(r["event_type"]),
-                "actor_user_id": r.get("actor_user_id"),
-                "actor_role_id": r.get("actor_role_id"),
-                "payload": r.get("payload") or {},
-                "created_at": r["created_at"].isoformat() if r.get("created_at") else None,
+                "audit_id": audit_id,
+                "task_id": ev_task_id,
+                "event_type": event_type,
+                "actor_user_id": actor_user_id,
+                "actor_role_id": actor_role_id,
+                "payload": payload or {},
+                "created_at": created_at,
             }
-        )
-    return items
+            for audit_id, ev_task_id, event_type, actor_user_id, actor_role_id, payload, created_at in result
+        ]
+    return RowsJSONResponse(items)
 
 
 @router.get("/tasks/me/events")
@@ -242,7 +249,7 @@ def bot_list_my_task_events(
     since_audit_id: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
     user: Dict[str, Any] = Depends(require_bot_bound_user),
-) -> Dict[str, Any]:
+) -> RowsJSONResponse:
     token = (os.getenv("INTERNAL_API_TOKEN") or "").strip()
     return list_my_task_events(
         authorization=None,
@@ -5,7 +5,7 @@ import os
 import logging
 import asyncio
 from pathlib import Path
-from typing import Set, Optional, Any
+from typing import FrozenSet, Set, Optional, Any
 
 from dotenv import load_dotenv
 from telegram import Update
@@ -63,15 +63,9 @@ EVENTS_STATE_PATH = Path(os.getenv("EVENTS_STATE_PATH", str(DATA_DIR / "bot_even
 EVENTS_POLL_TYPES_RAW = (os.getenv("EVENTS_POLL_TYPES") or "").strip()
 
 
-def _parse_admin_ids(raw: str) -> Set[int]:
-    if not raw:
-        return set()
-    out: Set[int] = set()
-    for part in raw.split(","):
-        p = part.strip()
-        if p.isdigit():
-            out.add(int(p))
-    return out
+def _parse_admin_ids(raw: str) -> FrozenSet[int]:
+    # Parsed once at import; handlers only test membership.
+    return frozenset(int(p) for p in (part.strip() for part in raw.split(",")) if p.isdigit())
 
 
 def _parse_poll_types(raw: str) -> Set[str]:
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import logging
+from typing import AbstractSet
 
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -11,7 +12,7 @@ from ..integrations.corpsite_api import CorpsiteAPI
 log = logging.getLogger("corpsite-bot")
 
 
-def _is_admin(tg_user_id: int, admin_ids: set[int]) -> bool:
+def _is_admin(tg_user_id: int, admin_ids: AbstractSet[int]) -> bool:
     return tg_user_id in admin_ids
 
 
@@ -54,8 +55,10 @@ async def cmd_unbind(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
                 await msg.reply_text("Формат: /unbind или /unbind <tg_user_id>")
                 return
 
-            admin_ids_raw = context.bot_data.get("admin_tg_ids", set())
-            admin_ids: set[int] = admin_ids_raw if isinstance(admin_ids_raw, set) else set(admin_ids_raw)
+            admin_ids_raw = context.bot_data.get("admin_tg_ids", frozenset())
+            admin_ids: AbstractSet[int] = (
+                admin_ids_raw if isinstance(admin_ids_raw, (set, frozenset)) else frozenset(admin_ids_raw)
+            )
             if not _is_admin(actor_tg_id, admin_ids):
                 await msg.reply_text("Доступ запрещён.")
                 return
@@ -220,9 +220,12 @@ def _rolled_back_migration_connection():
             transaction.rollback()
 
 
-def test_revision_is_the_single_head_and_has_exact_parent() -> None:
+def test_revision_is_on_the_single_head_lineage_and_has_exact_parent() -> None:
     script = ScriptDirectory.from_config(_alembic_config())
-    assert script.get_heads() == [REVISION_F2]
+    heads = script.get_heads()
+    assert len(heads) == 1
+    lineage = {rev.revision for rev in script.walk_revisions(base="base", head=heads[0])}
+    assert REVISION_F2 in lineage
     revision = script.get_revision(REVISION_F2)
     assert revision is not None
     assert revision.down_revision == REVISION_PRE_F2
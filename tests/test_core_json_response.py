@@ -0,0 +1,35 @@
+# tests/test_core_json_response.py
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.json_response import RowsJSONResponse
+
+
+def test_rows_json_response_matches_jsonable_encoder() -> None:
+    body = {
+        "items": [
+            {
+                "task_id": 7,
+                "title": "Отчёт",
+                "created_at": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+                "due_date": date(2026, 1, 31),
+                "score": Decimal("1.50"),
+                "count": Decimal("10"),
+                "ref": UUID("12345678-1234-5678-1234-567812345678"),
+                "note": None,
+            }
+        ],
+        "total": 1,
+    }
+
+    resp = RowsJSONResponse(body)
+
+    assert resp.media_type == "application/json; charset=utf-8"
+    assert json.loads(resp.body) == jsonable_encoder(body)
+    assert "Отчёт".encode("utf-8") in resp.body
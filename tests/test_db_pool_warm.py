@@ -0,0 +1,21 @@
+# tests/test_db_pool_warm.py
+from __future__ import annotations
+
+import pytest
+
+from app.db import engine as db_engine
+from tests.test_auth_me_telegram import _db_available
+
+
+def test_warm_pool_disabled_by_default() -> None:
+    assert db_engine.warm_pool(0) == 0
+
+
+@pytest.mark.skipif(not _db_available(), reason="PostgreSQL not available")
+def test_warm_pool_leaves_connections_checked_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db_engine, "DB_EXTERNAL_POOLER", False)
+
+    opened = db_engine.warm_pool(2)
+
+    assert opened == min(2, db_engine.DB_POOL_SIZE)
+    assert db_engine.engine.pool.checkedin() >= opened
@@ -0,0 +1,28 @@
+# tests/test_no_duplicate_top_level_defs.py
+"""Guard: a module must not define the same top-level function/class twice (last one silently wins)."""
+from __future__ import annotations
+
+import ast
+from collections import Counter
+from pathlib import Path
+
+APP_ROOT = Path(__file__).resolve().parents[1] / "app"
+
+
+def _duplicate_top_level_names(source_path: Path) -> list[str]:
+    tree = ast.parse(source_path.read_text(encoding="utf-8"))
+    names = Counter(
+        node.name
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    )
+    return sorted(name for name, count in names.items() if count > 1)
+
+
+def test_app_modules_have_no_duplicate_top_level_definitions() -> None:
+    offenders = {}
+    for source_path in sorted(APP_ROOT.rglob("*.py")):
+        duplicates = _duplicate_top_level_names(source_path)
+        if duplicates:
+            offenders[str(source_path.relative_to(APP_ROOT.parent))] = duplicates
+    assert offenders == {}
@@ -161,6 +161,41 @@ def test_task_list_via_internal_bot_api(client: TestClient, seed: Dict[str, Any]
     assert "items" in body
 
 
+@pytest.mark.skipif(not _db_available(), reason="PostgreSQL not available")
+def test_task_events_via_internal_bot_api(client: TestClient, seed: Dict[str, Any]) -> None:
+    from app.events import create_task_event
+    from tests.conftest import cleanup_task, create_task
+
+    user_id = int(seed["executor_user_id"])
+    _set_user_telegram(user_id, telegram_id=str(TG_USER_ID))
+    task_id = create_task(
+        period_id=seed["period_id"],
+        title="pytest bot task events",
+        initiator_user_id=seed["initiator_user_id"],
+        executor_role_id=seed["executor_role_id"],
+        assignment_scope=seed["assignment_scope"],
+        status_code="IN_PROGRESS",
+        unit_id=seed["unit_id"],
+    )
+    try:
+        create_task_event(
+            task_id=task_id,
+            event_type="REPORT_SUBMITTED",
+            actor_user_id=user_id,
+            actor_role_id=int(seed["executor_role_id"]),
+            payload={"note": "pytest"},
+        )
+
+        resp = client.get(f"/internal/bot/tasks/{task_id}/events", headers=_bot_headers(TG_USER_ID))
+        assert resp.status_code == 200, resp.text
+        items = resp.json()
+        assert [it["event_type"] for it in items] == ["REPORT_SUBMITTED"]
+        assert items[0]["payload"]["note"] == "pytest"
+        assert isinstance(items[0]["created_at"], str)
+    finally:
+        cleanup_task(task_id)
+
+
 def test_legacy_json_bindings_disabled_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv("TELEGRAM_LEGACY_JSON_BINDINGS", raising=False)
     mod = _load_bindings_module()
@@ -29,6 +29,27 @@ def test_actions_report_moves_to_waiting_approval(client, seed):
         cleanup_task(task_id)
 
 
+def test_actions_report_rejects_non_string_link(client, seed):
+    task_id = create_task(
+        period_id=seed["period_id"],
+        title=seed["title"],
+        initiator_user_id=seed["initiator_user_id"],
+        executor_role_id=seed["executor_role_id"],
+        assignment_scope=seed["assignment_scope"],
+        status_code="WAITING_REPORT",
+    )
+
+    try:
+        r = client.post(
+            f"/tasks/{task_id}/report",
+            json={"report_link": 42},
+            headers=auth_headers(seed["executor_user_id"]),
+        )
+        assert r.status_code == 422, r.text
+    finally:
+        cleanup_task(task_id)
+
+
 def test_actions_reject_moves_back_to_waiting_report(client, seed):
     task_id = create_task(
         period_id=seed["period_id"],
@@ -57,3 +78,48 @@ def test_actions_reject_moves_back_to_waiting_report(client, seed):
         assert data["status_code"] == "WAITING_REPORT"
     finally:
         cleanup_task(task_id)
+
+
+def test_actions_approve_closes_task_and_signs_report(client, seed):
+    from sqlalchemy import text
+
+    from app.db.engine import engine
+
+    task_id = create_task(
+        period_id=seed["period_id"],
+        title=seed["title"],
+        initiator_user_id=seed["initiator_user_id"],
+        executor_role_id=seed["executor_role_id"],
+        assignment_scope=seed["assignment_scope"],
+        status_code="WAITING_APPROVAL",
+    )
+
+    try:
+        upsert_report(
+            task_id=task_id,
+            submitted_by=seed["executor_user_id"],
+            report_link="https://example.com/report",
+            current_comment="initial",
+        )
+
+        r = client.post(
+            f"/tasks/{task_id}/approve",
+            json={"current_comment": "accepted"},
+            headers=auth_headers(seed["initiator_user_id"]),
+        )
+        assert r.status_code == 200, r.text
+        assert r.json()["status_code"] == "DONE"
+
+        with engine.connect() as conn:
+            rep = conn.execute(
+                text(
+                    "SELECT approved_by, approved_at, current_comment "
+                    "FROM public.task_reports WHERE task_id = :tid"
+                ),
+                {"tid": task_id},
+            ).mappings().one()
+        assert int(rep["approved_by"]) == int(seed["initiator_user_id"])
+        assert rep["approved_at"] is not None
+        assert rep["current_comment"] == "accepted"
+    finally:
+        cleanup_task(task_id)
@@ -0,0 +1,34 @@
+# tests/test_tasks_assignment_scope_cache.py
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.engine import engine
+from app.services import tasks_service
+
+
+def test_enum_labels_loaded_once_and_normalization_is_case_insensitive() -> None:
+    tasks_service.reset_assignment_scope_cache()
+    with engine.connect() as conn:
+        labels = tasks_service.load_assignment_scope_enum_labels(conn)
+        assert labels
+
+    # Cache is warm: no connection needed any more.
+    assert tasks_service.load_assignment_scope_enum_labels(None) is labels
+
+    lower = {lbl.lower(): lbl for lbl in labels}
+    if "functional" in lower:
+        assert tasks_service.normalize_assignment_scope(None, "FUNCTIONAL") == lower["functional"]
+        assert tasks_service.normalize_assignment_scope(None, "role") == lower["functional"]
+        assert tasks_service.normalize_assignment_scope(None, None) == lower["functional"]
+    if "admin" in lower:
+        assert tasks_service.normalize_assignment_scope(None, " user ") == lower["admin"]
+
+
+def test_unknown_scope_raises_422() -> None:
+    tasks_service.reset_assignment_scope_cache()
+    with engine.connect() as conn:
+        with pytest.raises(HTTPException) as exc:
+            tasks_service.normalize_assignment_scope(conn, "no-such-scope")
+    assert exc.value.status_code == 422
@@ -0,0 +1,92 @@
+# tests/test_tasks_delete.py
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from sqlalchemy import text
+
+from app.db.engine import engine
+from app.services.tasks_service import SYSTEM_ADMIN_ROLE_ID
+from tests.conftest import auth_headers, cleanup_task, create_unit, create_user
+
+
+def _admin_user_id(conn) -> int:
+    row = conn.execute(
+        text(
+            """
+            SELECT user_id
+            FROM public.users
+            WHERE role_id = :role_id
+              AND COALESCE(is_active, TRUE) = TRUE
+            LIMIT 1
+            """
+        ),
+        {"role_id": int(SYSTEM_ADMIN_ROLE_ID)},
+    ).first()
+    if row:
+        return int(row[0])
+
+    unit_id = create_unit(conn, "pytest_tasks_delete_admin_unit")
+    return create_user(
+        conn,
+        full_name="Pytest Tasks Delete Admin",
+        role_id=int(SYSTEM_ADMIN_ROLE_ID),
+        unit_id=unit_id,
+    )
+
+
+def _create_task(client, seed: Dict[str, Any], title: str) -> int:
+    uid = int(seed["initiator_user_id"])
+    created = client.post(
+        "/tasks/",
+        json={
+            "title": title,
+            "period_id": int(seed["period_id"]),
+            "executor_role_id": int(seed["executor_role_id"]),
+            "assignment_scope": seed["assignment_scope"],
+            "status_code": "IN_PROGRESS",
+            "approver_user_id": uid,
+        },
+        headers=auth_headers(uid),
+    )
+    assert created.status_code == 200, created.text
+    return int(created.json()["task_id"])
+
+
+def test_hard_delete_by_admin_removes_task_and_history(client, seed) -> None:
+    task_id = _create_task(client, seed, "pytest hard delete")
+    with engine.begin() as conn:
+        admin_id = _admin_user_id(conn)
+
+    try:
+        r = client.delete(f"/tasks/{task_id}?hard=true", headers=auth_headers(admin_id))
+        assert r.status_code == 204, r.text
+
+        with engine.connect() as conn:
+            for table in ("tasks", "task_events", "task_audit_log", "task_reports"):
+                left = conn.execute(
+                    text(f"SELECT COUNT(*) FROM public.{table} WHERE task_id = :tid"),
+                    {"tid": task_id},
+                ).scalar()
+                assert int(left or 0) == 0, table
+
+        again = client.delete(f"/tasks/{task_id}?hard=true", headers=auth_headers(admin_id))
+        assert again.status_code == 404, again.text
+    finally:
+        cleanup_task(task_id)
+
+
+def test_hard_delete_by_initiator_is_forbidden(client, seed) -> None:
+    task_id = _create_task(client, seed, "pytest hard delete forbidden")
+
+    try:
+        r = client.delete(
+            f"/tasks/{task_id}?hard=true",
+            headers=auth_headers(int(seed["initiator_user_id"])),
+        )
+        assert r.status_code == 403, r.text
+
+        fetched = client.get(f"/tasks/{task_id}", headers=auth_headers(int(seed["initiator_user_id"])))
+        assert fetched.status_code == 200, fetched.text
+    finally:
+        cleanup_task(task_id)
@@ -196,3 +196,139 @@ def test_search_does_not_leak_tasks_outside_mine_scope(client, seed):
     finally:
         for task_id in task_ids:
             cleanup_task(task_id)
+
+
+def test_total_is_stable_across_pages_and_past_the_end(client, seed):
+    unique_title = "PytestSearchPagingTotal"
+    task_ids: list[int] = []
+
+    try:
+        for i in range(3):
+            task_ids.append(
+                create_task(
+                    period_id=seed["period_id"],
+                    title=f"{unique_title} {i}",
+                    initiator_user_id=seed["initiator_user_id"],
+                    executor_role_id=seed["executor_role_id"],
+                    assignment_scope=seed["assignment_scope"],
+                    status_code="WAITING_REPORT",
+                    unit_id=seed["unit_id"],
+                )
+            )
+
+        totals = []
+        for offset in (0, 2, 10):
+            resp = _list_tasks(
+                client,
+                seed["executor_user_id"],
+                scope="mine",
+                limit=2,
+                offset=offset,
+                search=unique_title,
+            )
+            assert resp.status_code == 200, resp.text
+            body = resp.json()
+            totals.append(body["total"])
+            assert all("total_count" not in it for it in body["items"])
+            if offset == 10:
+                assert body["items"] == []
+
+        assert totals == [3, 3, 3]
+    finally:
+        for task_id in task_ids:
+            cleanup_task(task_id)
+
+
+def test_cursor_pagination_walks_all_rows_without_offset(client, seed):
+    unique_title = "PytestSearchCursorWalk"
+    task_ids: list[int] = []
+
+    try:
+        for i in range(3):
+            task_ids.append(
+                create_task(
+                    period_id=seed["period_id"],
+                    title=f"{unique_title} {i}",
+                    initiator_user_id=seed["initiator_user_id"],
+                    executor_role_id=seed["executor_role_id"],
+                    assignment_scope=seed["assignment_scope"],
+                    status_code="WAITING_REPORT",
+                    unit_id=seed["unit_id"],
+                )
+            )
+
+        seen: list[int] = []
+        params = {"scope": "mine", "limit": 2, "search": unique_title}
+        first = _list_tasks(client, seed["executor_user_id"], **params)
+        assert first.status_code == 200, first.text
+        first_body = first.json()
+        seen.extend(int(it["task_id"]) for it in first_body["items"])
+        assert first_body["next_cursor"] == seen[-1]
+
+        second = _list_tasks(client, seed["executor_user_id"], cursor=first_body["next_cursor"], **params)
+        assert second.status_code == 200, second.text
+        second_body = second.json()
+        seen.extend(int(it["task_id"]) for it in second_body["items"])
+        assert second_body["next_cursor"] is None
+        assert second_body["total"] == 1
+
+        assert seen == sorted(task_ids, reverse=True)
+    finally:
+        for task_id in task_ids:
+            cleanup_task(task_id)
+
+
+def test_list_cache_is_invalidated_by_task_writes(client, seed, monkeypatch):
+    from app.services import tasks_router
+
+    monkeypatch.setattr(tasks_router, "_LIST_CACHE_TTL_S", 30.0)
+    tasks_router._invalidate_list_cache()
+    uid = int(seed["initiator_user_id"])
+    unique_title = "PytestListCacheInvalidate"
+    task_ids: list[int] = []
+
+    try:
+        before = _list_tasks(client, uid, scope="mine", search=unique_title, limit=10)
+        assert before.status_code == 200, before.text
+        assert before.json()["total"] == 0
+        assert len(tasks_router._LIST_CACHE) == 1
+
+        created = client.post(
+            "/tasks/",
+            json={
+                "title": unique_title,
+                "period_id": int(seed["period_id"]),
+                "executor_role_id": int(seed["initiator_role_id"]),
+                "assignment_scope": seed["assignment_scope"],
+                "status_code": "IN_PROGRESS",
+                "approver_user_id": uid,
+            },
+            headers=auth_headers(uid),
+        )
+        assert created.status_code == 200, created.text
+        task_ids.append(int(created.json()["task_id"]))
+        assert tasks_router._LIST_CACHE == {}
+
+        after = _list_tasks(client, uid, scope="mine", search=unique_title, limit=10)
+        assert after.status_code == 200, after.text
+        assert [int(it["task_id"]) for it in after.json()["items"]] == task_ids
+    finally:
+        tasks_router._invalidate_list_cache()
+        for task_id in task_ids:
+            cleanup_task(task_id)
+
+
+def test_list_statement_is_reused_across_filter_values(client, seed):
+    from app.services import tasks_router
+
+    uid = int(seed["initiator_user_id"])
+    tasks_router._list_sql.cache_clear()
+
+    for search in ("PytestStmtReuseA", "PytestStmtReuseB"):
+        r = _list_tasks(client, uid, scope="mine", search=search, limit=5)
+        assert r.status_code == 200, r.text
+
+    # Same filter shape, different values: one cached TextClause, one hit.
+    info = tasks_router._list_sql.cache_info()
+    assert info.currsize == 1
+    assert info.hits == 1
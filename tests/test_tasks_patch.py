@@ -0,0 +1,85 @@
+# tests/test_tasks_patch.py
+from __future__ import annotations
+
+from tests.conftest import auth_headers, cleanup_task
+
+
+def test_patch_task_returns_full_updated_row(client, seed) -> None:
+    uid = int(seed["initiator_user_id"])
+    created = client.post(
+        "/tasks/",
+        json={
+            "title": "pytest patch before",
+            "period_id": int(seed["period_id"]),
+            "executor_role_id": int(seed["executor_role_id"]),
+            "assignment_scope": seed["assignment_scope"],
+            "status_code": "IN_PROGRESS",
+            "approver_user_id": uid,
+        },
+        headers=auth_headers(uid),
+    )
+    assert created.status_code == 200, created.text
+    created_body = created.json()
+    task_id = int(created_body["task_id"])
+    assert created_body["status_code"] == "IN_PROGRESS"
+    assert "allowed_actions" in created_body
+
+    try:
+        r = client.patch(
+            f"/tasks/{task_id}",
+            json={"title": "pytest patch after", "description": "patched"},
+            headers=auth_headers(uid),
+        )
+        assert r.status_code == 200, r.text
+        body = r.json()
+        assert int(body["task_id"]) == task_id
+        assert body["title"] == "pytest patch after"
+        assert body["description"] == "patched"
+        assert body["status_code"] == created_body["status_code"]
+        assert body["executor_role_code"] == created_body["executor_role_code"]
+        assert "allowed_actions" in body
+
+        fetched = client.get(f"/tasks/{task_id}", headers=auth_headers(uid))
+        assert fetched.status_code == 200, fetched.text
+        assert fetched.json()["title"] == "pytest patch after"
+    finally:
+        cleanup_task(task_id)
+
+
+def test_patch_task_by_non_initiator_is_404(client, seed) -> None:
+    uid = int(seed["initiator_user_id"])
+    created = client.post(
+        "/tasks/",
+        json={
+            "title": "pytest patch foreign",
+            "period_id": int(seed["period_id"]),
+            "executor_role_id": int(seed["executor_role_id"]),
+            "assignment_scope": seed["assignment_scope"],
+            "status_code": "IN_PROGRESS",
+            "approver_user_id": uid,
+        },
+        headers=auth_headers(uid),
+    )
+    assert created.status_code == 200, created.text
+    task_id = int(created.json()["task_id"])
+
+    try:
+        r = client.patch(
+            f"/tasks/{task_id}",
+            json={"title": "hijacked"},
+            headers=auth_headers(int(seed["executor_user_id"])),
+        )
+        assert r.status_code == 404, r.text
+    finally:
+        cleanup_task(task_id)
+
+
+def test_patch_task_rejects_unknown_fields(client, seed) -> None:
+    uid = int(seed["initiator_user_id"])
+    r = client.patch(
+        "/tasks/1",
+        json={"title": "x", "status_code": "DONE", "bogus": 1},
+        headers=auth_headers(uid),
+    )
+    assert r.status_code == 422, r.text
+    assert r.json()["detail"] == "Unknown fields: bogus, status_code"
@@ -0,0 +1,52 @@
+# tests/test_tasks_status_cache.py
+from __future__ import annotations
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.engine import engine
+from app.services import tasks_service
+
+
+class _CountingConn:
+    def __init__(self, conn) -> None:
+        self._conn = conn
+        self.calls = 0
+
+    def execute(self, *args, **kwargs):
+        self.calls += 1
+        return self._conn.execute(*args, **kwargs)
+
+
+def test_status_id_lookup_is_cached_and_case_insensitive() -> None:
+    tasks_service.reset_status_id_cache()
+    with engine.connect() as raw:
+        conn = _CountingConn(raw)
+        expected = raw.execute(
+            tasks_service.text("SELECT status_id FROM task_statuses WHERE code = 'IN_PROGRESS'")
+        ).scalar_one()
+
+        assert tasks_service.get_status_id_by_code(conn, "IN_PROGRESS") == int(expected)
+        assert tasks_service.get_status_id_by_code(conn, " in_progress ") == int(expected)
+        assert conn.calls == 1
+
+
+def test_unknown_status_code_still_raises_400() -> None:
+    tasks_service.reset_status_id_cache()
+    with engine.connect() as conn:
+        with pytest.raises(HTTPException) as exc:
+            tasks_service.get_status_id_by_code(conn, "NO_SUCH_STATUS")
+    assert exc.value.status_code == 400
+
+
+def test_warm_reference_caches_preloads_statuses_and_scopes() -> None:
+    tasks_service.reset_status_id_cache()
+    tasks_service.reset_assignment_scope_cache()
+    with engine.connect() as conn:
+        tasks_service.warm_reference_caches(conn)
+
+    # Both lookups are served from memory now: no connection is touched.
+    idle = _CountingConn(None)
+    assert tasks_service.get_status_id_by_code(idle, "IN_PROGRESS") > 0
+    assert tasks_service.load_assignment_scope_enum_labels(idle)
+    assert idle.calls == 0
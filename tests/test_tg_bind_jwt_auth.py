@@ -175,3 +175,143 @@ def test_tg_bind_code_non_privileged_role_does_not_need_allowlist(
     resp = client.post("/me/tg-bind-code", headers=auth_headers(user_id))
     assert resp.status_code == 200, resp.text
     assert resp.json().get("code")
+
+
+def test_tg_bind_consume_keeps_code_when_bind_fails(
+    client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from datetime import datetime, timedelta, timezone
+
+    from fastapi import HTTPException
+
+    import app.tg_bind as tg_bind
+
+    monkeypatch.setattr("app.tg_bind.BOT_BIND_TOKEN", "test-bot-bind-token")
+    _CODES.clear()
+    tg_bind._ACTIVE_CODE_BY_USER.clear()
+
+    code = "ABCDEFGH-1234"
+    tg_bind._store_code(
+        tg_bind._hash_code(code),
+        tg_bind._BindCodeRecord(
+            user_id=424242,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=5),
+        ),
+    )
+
+    def _conflict(**_: Any) -> None:
+        raise HTTPException(status_code=409, detail="telegram already bound")
+
+    bound: Dict[str, int] = {}
+    monkeypatch.setattr("app.tg_bind._bind_user_to_telegram", _conflict)
+    consume_headers = {"X-Bot-Bind-Token": "test-bot-bind-token"}
+    failed = client.post(
+        "/tg/bind/consume",
+        headers=consume_headers,
+        json={"code": code.lower(), "tg_user_id": 9_000_000_002},
+    )
+    assert failed.status_code == 409, failed.text
+
+    monkeypatch.setattr("app.tg_bind._bind_user_to_telegram", lambda **kw: bound.update(kw))
+    ok = client.post(
+        "/tg/bind/consume",
+        headers=consume_headers,
+        json={"code": code, "tg_user_id": 9_000_000_002},
+    )
+    assert ok.status_code == 200, ok.text
+    assert bound == {"user_id": 424242, "tg_user_id": 9_000_000_002}
+
+    reused = client.post(
+        "/tg/bind/consume",
+        headers=consume_headers,
+        json={"code": code, "tg_user_id": 9_000_000_002},
+    )
+    assert reused.status_code == 409, reused.text
+    assert _response_error_code(reused.json()) == "TGBIND_CONFLICT_CODE_INVALID"
+
+
+def test_tg_user_cache_serves_bound_ids_and_clears_on_bind(monkeypatch: pytest.MonkeyPatch) -> None:
+    import app.tg_bind as tg_bind
+
+    calls = []
+
+    class _Conn:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, stmt, params):
+            calls.append(params["tg"])
+            return self
+
+        def fetchone(self):
+            return (77,)
+
+    monkeypatch.setattr(tg_bind, "connect_autocommit", _Conn)
+    monkeypatch.setattr(tg_bind, "_TG_USER_CACHE_TTL_S", 60.0)
+    tg_bind._invalidate_tg_user_cache()
+
+    assert tg_bind.resolve_user_id_by_telegram_id(555) == 77
+    assert tg_bind.resolve_user_id_by_telegram_id(555) == 77
+    assert calls == ["555"]
+
+    tg_bind._invalidate_tg_user_cache()
+    assert tg_bind.resolve_user_id_by_telegram_id(555) == 77
+    assert calls == ["555", "555"]
+    tg_bind._invalidate_tg_user_cache()
+
+
+@pytest.mark.skipif(not _db_available(), reason="PostgreSQL not available")
+def test_bind_user_to_telegram_treats_blank_telegram_id_as_unbound(monkeypatch: pytest.MonkeyPatch) -> None:
+    from contextlib import nullcontext
+
+    import app.tg_bind as tg_bind
+
+    # Production rows may hold telegram_id as text, blank included; a session-local
+    # table shadows public.users for the unqualified names in the bind statement.
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(text("CREATE TEMP TABLE users (user_id bigint PRIMARY KEY, telegram_id text)"))
+            conn.execute(text("INSERT INTO users (user_id, telegram_id) VALUES (1, ''), (2, '  ')"))
+            monkeypatch.setattr(tg_bind, "engine", type("_E", (), {"begin": lambda self: nullcontext(conn)})())
+
+            tg_bind._bind_user_to_telegram(user_id=1, tg_user_id=9_000_000_011)
+            tg_bind._bind_user_to_telegram(user_id=2, tg_user_id=9_000_000_012)
+
+            rows = dict(conn.execute(text("SELECT user_id, telegram_id FROM users")).fetchall())
+            assert rows == {1: "9000000011", 2: "9000000012"}
+        finally:
+            trans.rollback()
+
+
+def test_bind_user_to_telegram_zero_row_update_is_not_success(monkeypatch: pytest.MonkeyPatch) -> None:
+    from fastapi import HTTPException
+
+    import app.tg_bind as tg_bind
+
+    class _Conn:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, stmt, params):
+            return self
+
+        def mappings(self):
+            return self
+
+        def first(self):
+            return {"other_user_id": None, "user_exists": True, "existing_tg": None, "updated": False}
+
+    monkeypatch.setattr(tg_bind, "engine", type("_E", (), {"begin": lambda self: _Conn()})())
+
+    with pytest.raises(HTTPException) as exc:
+        tg_bind._bind_user_to_telegram(user_id=1, tg_user_id=9_000_000_013)
+    assert exc.value.status_code == 409
+    assert exc.value.detail["code"] == "TGBIND_CONFLICT_USER_ALREADY_BOUND"